@@ -26,6 +26,14 @@ fileConfig(config.config_file_name)
 
 target_metadata = SQLModel.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The APScheduler job store manages its own table.
+    if type_ == "table" and name == "apscheduler_jobs":
+        return False
+    return True
+
+
 db_url = str(settings.ASYNC_DATABASE_URI)
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -47,6 +55,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -55,7 +64,11 @@ def run_migrations_offline():
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,60 @@
+"""add the DeliveryOutbox table
+
+Revision ID: 7d5da12714db
+Revises: a37befc37752
+Create Date: 2026-10-18 09:12:41.218337
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7d5da12714db"
+down_revision = "a37befc37752"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "DeliveryOutbox",
+        sa.Column("id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("content_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("subscriber_id", sqlmodel.sql.sqltypes.GUID(), nullable=False),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("claimed_by", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["content_id"], ["Content.id"]),
+        sa.ForeignKeyConstraint(["subscriber_id"], ["Subscriber.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "content_id",
+            "subscriber_id",
+            name="uq_DeliveryOutbox_content_subscriber",
+        ),
+    )
+    op.create_index(
+        op.f("ix_DeliveryOutbox_id"), "DeliveryOutbox", ["id"], unique=True
+    )
+    op.create_index(
+        op.f("ix_DeliveryOutbox_content_id"),
+        "DeliveryOutbox",
+        ["content_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_DeliveryOutbox_status_created_at",
+        "DeliveryOutbox",
+        ["status", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_table("DeliveryOutbox")
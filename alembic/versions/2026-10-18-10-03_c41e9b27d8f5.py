@@ -0,0 +1,33 @@
+"""add partial index on unsent Content scheduled_time
+
+Revision ID: c41e9b27d8f5
+Revises: 7d5da12714db
+Create Date: 2026-10-18 10:03:12.540921
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c41e9b27d8f5"
+down_revision = "7d5da12714db"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_Content_unsent_scheduled_time",
+        "Content",
+        ["scheduled_time"],
+        unique=False,
+        postgresql_where=sa.text("sent = false"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_Content_unsent_scheduled_time", table_name="Content")
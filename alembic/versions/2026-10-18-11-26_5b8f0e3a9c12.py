@@ -0,0 +1,30 @@
+"""add attempts column to DeliveryLog
+
+Revision ID: 5b8f0e3a9c12
+Revises: c41e9b27d8f5
+Create Date: 2026-10-18 11:26:05.117462
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8f0e3a9c12"
+down_revision = "c41e9b27d8f5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "DeliveryLog",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+
+def downgrade():
+    op.drop_column("DeliveryLog", "attempts")
@@ -0,0 +1,47 @@
+"""unique delivery per content and subscriber in DeliveryLog
+
+Revision ID: 9e2d6c1f4a70
+Revises: 5b8f0e3a9c12
+Create Date: 2026-10-18 12:41:37.508214
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e2d6c1f4a70"
+down_revision = "5b8f0e3a9c12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep one row per delivery, preferring a "sent" row, then the newest.
+    op.execute(
+        """
+        DELETE FROM "DeliveryLog" AS d
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY content_id, subscriber_id
+                ORDER BY (status = 'sent') DESC, created_at DESC
+            ) AS rank
+            FROM "DeliveryLog"
+        ) AS ranked
+        WHERE d.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_unique_constraint(
+        "uq_DeliveryLog_content_subscriber",
+        "DeliveryLog",
+        ["content_id", "subscriber_id"],
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_DeliveryLog_content_subscriber", "DeliveryLog", type_="unique"
+    )
@@ -0,0 +1,61 @@
+"""replace Content.sent with a status column
+
+Revision ID: 3c7a9d2e61b4
+Revises: 9e2d6c1f4a70
+Create Date: 2026-10-18 13:52:11.840395
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c7a9d2e61b4"
+down_revision = "9e2d6c1f4a70"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "Content",
+        sa.Column(
+            "status",
+            sqlmodel.sql.sqltypes.AutoString(),
+            nullable=False,
+            server_default="scheduled",
+        ),
+    )
+    op.execute("""UPDATE "Content" SET status = 'sent' WHERE sent = true""")
+    op.drop_index("ix_Content_unsent_scheduled_time", table_name="Content")
+    op.drop_column("Content", "sent")
+    op.create_index(
+        "ix_Content_pending_scheduled_time",
+        "Content",
+        ["scheduled_time"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('scheduled', 'sending')"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_Content_pending_scheduled_time", table_name="Content")
+    op.add_column(
+        "Content",
+        sa.Column("sent", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.execute(
+        """UPDATE "Content" SET sent = true
+        WHERE status IN ('sent', 'partially_failed')"""
+    )
+    op.drop_column("Content", "status")
+    op.create_index(
+        "ix_Content_unsent_scheduled_time",
+        "Content",
+        ["scheduled_time"],
+        unique=False,
+        postgresql_where=sa.text("sent = false"),
+    )
@@ -0,0 +1,47 @@
+"""unique subscription per subscriber and topic
+
+Revision ID: b71f3e8a05d2
+Revises: 3c7a9d2e61b4
+Create Date: 2026-10-18 14:58:12.094317
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b71f3e8a05d2"
+down_revision = "3c7a9d2e61b4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest subscription for each subscriber and topic.
+    op.execute(
+        """
+        DELETE FROM "Subscription" AS s
+        USING (
+            SELECT id, row_number() OVER (
+                PARTITION BY subscriber_id, topic_id
+                ORDER BY created_at, id
+            ) AS rank
+            FROM "Subscription"
+        ) AS ranked
+        WHERE s.id = ranked.id AND ranked.rank > 1
+        """
+    )
+    op.create_unique_constraint(
+        "uq_Subscription_subscriber_topic",
+        "Subscription",
+        ["subscriber_id", "topic_id"],
+    )
+
+
+def downgrade():
+    op.drop_constraint(
+        "uq_Subscription_subscriber_topic", "Subscription", type_="unique"
+    )
@@ -0,0 +1,38 @@
+"""composite topic/subscriber index on Subscription
+
+Revision ID: d4a8c2f17e39
+Revises: b71f3e8a05d2
+Create Date: 2026-10-18 16:04:51.336120
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4a8c2f17e39"
+down_revision = "b71f3e8a05d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_Subscription_topic_id_subscriber_id",
+        "Subscription",
+        ["topic_id", "subscriber_id"],
+    )
+    # The composite index has topic_id as its leading column.
+    op.drop_index("ix_Subscription_topic_id", table_name="Subscription")
+
+
+def downgrade():
+    op.create_index(
+        "ix_Subscription_topic_id", "Subscription", ["topic_id"], unique=False
+    )
+    op.drop_index(
+        "ix_Subscription_topic_id_subscriber_id", table_name="Subscription"
+    )
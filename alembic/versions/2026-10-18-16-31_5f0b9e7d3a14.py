@@ -0,0 +1,37 @@
+"""sending lease column on Content
+
+Revision ID: 5f0b9e7d3a14
+Revises: d4a8c2f17e39
+Create Date: 2026-10-18 16:31:07.615942
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5f0b9e7d3a14"
+down_revision = "d4a8c2f17e39"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "Content", sa.Column("lease_expires_at", sa.DateTime(), nullable=True)
+    )
+    # Contents being sent kept their lease in updated_at until now.
+    op.execute(
+        """
+        UPDATE "Content"
+        SET lease_expires_at = updated_at + interval '900 seconds'
+        WHERE status = 'sending'
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("Content", "lease_expires_at")
@@ -0,0 +1,54 @@
+"""due time of retrying deliveries on DeliveryLog
+
+Revision ID: 8a3e61c0b5f7
+Revises: 5f0b9e7d3a14
+Create Date: 2026-10-18 17:12:40.271583
+
+"""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+import sqlmodel  # added
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8a3e61c0b5f7"
+down_revision = "5f0b9e7d3a14"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "DeliveryLog", sa.Column("next_attempt_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_DeliveryLog_retry_due",
+        "DeliveryLog",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'retrying'"),
+    )
+    # Retries used to be APScheduler jobs; pending ones are due right away.
+    op.execute(
+        """
+        UPDATE "DeliveryLog" SET next_attempt_at = now() AT TIME ZONE 'utc'
+        WHERE status = 'retrying'
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('apscheduler_jobs') IS NOT NULL THEN
+                DELETE FROM apscheduler_jobs WHERE id LIKE 'retry\\_%';
+            END IF;
+        END $$
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_DeliveryLog_retry_due", table_name="DeliveryLog")
+    op.drop_column("DeliveryLog", "next_attempt_at")
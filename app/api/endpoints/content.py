@@ -3,14 +3,15 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, status
-from fastapi_pagination import Params
+from sqlmodel import select
 
 from app import crud
 from app.models.content_model import Content
 from app.models.topic_model import Topic
 from app.schemas.content_schema import (ContentCreate, ContentRead,
-                                        ContentUpdate)
-from app.schemas.response_schema import (IDeleteResponseBase, IGetResponseBase,
+                                        ContentStatus, ContentUpdate)
+from app.schemas.response_schema import (CursorPage, CursorParams,
+                                         IDeleteResponseBase, IGetResponseBase,
                                          IPostResponseBase, IPutResponseBase,
                                          create_response)
 from app.utils.exceptions.common_exceptions import (CustomException,
@@ -23,13 +24,13 @@ router = APIRouter()
 @router.get("/list")
 async def list_contents(
     topic_id: Optional[UUID] = None,
-    params: Params = Depends(),
-) -> IGetResponseBase[List[ContentRead]]:
+    params: CursorParams = Depends(),
+) -> IGetResponseBase[CursorPage[ContentRead]]:
 
+    query = select(Content)
     if topic_id:
-        items = await crud.content.get_by_topic_id(topic_id=topic_id)
-    else:
-        items = await crud.content.get_all()
+        query = query.where(Content.topic_id == topic_id)
+    items = await crud.content.get_multi_cursor(params=params, query=query)
     return create_response(data=items)
 
 
@@ -46,23 +47,29 @@ async def get_content_by_id(
 @router.get("/list/by-topic/{topic_id}")
 async def list_by_topic(
     topic_id: UUID,
-) -> IGetResponseBase[List[ContentRead]]:
+    params: CursorParams = Depends(),
+) -> IGetResponseBase[CursorPage[ContentRead]]:
     topic = await crud.topic.get_by_id(id=topic_id)
     if not topic:
         return IdNotFoundException(Topic, topic_id).get_response()
-    contents = await crud.content.get_by_topic_id(topic_id=topic_id)
+    contents = await crud.content.get_multi_cursor(
+        params=params, query=select(Content).where(Content.topic_id == topic_id)
+    )
     return create_response(data=contents)
 
 
 @router.get("/list/pending")
 async def list_pending_contents(
     as_of: Optional[datetime] = None,
-) -> IGetResponseBase[List[ContentRead]]:
+    params: CursorParams = Depends(),
+) -> IGetResponseBase[CursorPage[ContentRead]]:
     """
-    Return contents scheduled to be sent <= as_of (default now UTC) and not marked sent.
+    Return contents scheduled to be sent <= as_of (default now UTC) and not yet claimed for sending.
     """
     as_of = as_of or datetime.now(timezone.utc)
-    pending = await crud.content.get_pending_to_send(as_of=as_of)
+    pending = await crud.content.get_multi_cursor(
+        params=params, query=crud.content.pending_query(as_of=as_of)
+    )
     return create_response(data=pending)
 
 
@@ -85,6 +92,10 @@ async def create_content(
     if run_time.tzinfo is None:
         run_time = run_time.replace(tzinfo=timezone.utc)
 
+    await crud.content.notify_schedule_change(
+        id=created.id, action="schedule", scheduled_time=run_time
+    )
+
     return create_response(data=created)
 
 
@@ -97,14 +108,19 @@ async def update_content(
     if not current:
         return IdNotFoundException(Content, content_id).get_response()
 
-    if getattr(current, "sent", False):
+    if current.status != ContentStatus.SCHEDULED.value:
         return DataValidationError(
-            message="Cannot modify content that is already sent"
+            message="Cannot modify content that is being sent or already sent"
         ).get_response()
 
     original_run_time = getattr(current, "scheduled_time", None)
     updated = await crud.content.update(obj_current=current, obj_new=payload)
 
+    if updated.scheduled_time != original_run_time:
+        await crud.content.notify_schedule_change(
+            id=updated.id, action="schedule", scheduled_time=updated.scheduled_time
+        )
+
     return create_response(data=updated)
 
 
@@ -116,11 +132,12 @@ async def delete_content(
     if not current:
         return IdNotFoundException(Content, content_id).get_response()
 
-    if getattr(current, "sent", False):
+    if current.status != ContentStatus.SCHEDULED.value:
         return DataValidationError(
-            message="Cannot delete content that has already been sent"
+            message="Cannot delete content that is being sent or already sent"
         ).get_response()
 
-    delete_c = crud.content.remove(obj_current=current)
+    delete_c = await crud.content.remove(id=content_id)
+    await crud.content.notify_schedule_change(id=content_id, action="unschedule")
 
     return create_response(data={"deleted": True, "content_id": str(content_id)})
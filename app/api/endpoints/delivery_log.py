@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+
+from app import crud
+from app.delivery_log_export import MEDIA_TYPES, open_export
+from app.models.content_model import Content
+from app.schemas.delivery_log_schema import (DeliveryLogExportFormat,
+                                             DeliveryStatus)
+from app.utils.exceptions.common_exceptions import (CustomException,
+                                                    IdNotFoundException)
+
+router = APIRouter()
+
+
+def _naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    # DeliveryLog timestamps are naive UTC; offsets from the query string are
+    # converted first, and naive values are taken as UTC.
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@router.get("/export")
+async def export_delivery_logs_endpoint(
+    format: DeliveryLogExportFormat = DeliveryLogExportFormat.NDJSON,
+    content_id: Optional[UUID] = None,
+    status_: Optional[List[DeliveryStatus]] = Query(None, alias="status"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Stream delivery logs as CSV or NDJSON, optionally filtered by content,
+    status (repeatable) and a [since, until) range on the latest attempt.
+    Rows are read through a server-side cursor and written as they arrive,
+    so exporting a large send neither buffers it in memory nor waits for
+    more than the first batch. Naive `since`/`until` values are read as UTC.
+    """
+    since, until = _naive_utc(since), _naive_utc(until)
+    if since and until and since >= until:
+        return CustomException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            message="`since` must be earlier than `until`.",
+        ).get_response()
+    if content_id and not await crud.content.get_by_id(id=content_id):
+        return IdNotFoundException(Content, content_id).get_response()
+
+    filename = f"delivery-logs{'-' + str(content_id) if content_id else ''}"
+    body = await open_export(
+        format,
+        content_id=content_id,
+        statuses=[s.value for s in status_ or []],
+        since=since,
+        until=until,
+    )
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format.value}"'
+        },
+    )
@@ -1,19 +1,25 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_pagination import Params
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlmodel import select
 
 from app import crud
 from app.models.subscriber_model import Subscriber
-from app.schemas.response_schema import (IDeleteResponseBase, IGetResponseBase,
+from app.schemas.response_schema import (CursorPage, CursorParams,
+                                         IDeleteResponseBase, IGetResponseBase,
                                          IPostResponseBase, IPutResponseBase,
                                          create_response)
-from app.schemas.subscriber_schema import (SubscriberCreate, SubscriberRead,
-                                           SubscriberUpdate)
-from app.schemas.subscription_schema import (SubscriptionCreate,
+from app.schemas.subscriber_schema import (SubscriberCreate,
+                                           SubscriberImportFormat,
+                                           SubscriberImportResult,
+                                           SubscriberRead, SubscriberUpdate)
+from app.schemas.subscription_schema import (BulkSubscribeResult,
+                                             BulkSubscriptionRequest,
+                                             BulkUnsubscribeResult,
+                                             SubscriptionCreate,
                                              SubscriptionRead)
+from app.subscriber_import import SubscriberImport, iter_lines, parse_rows
 from app.utils.exceptions.common_exceptions import (CustomException,
                                                     DataValidationError,
                                                     IdNotFoundException)
@@ -23,10 +29,10 @@ router = APIRouter()
 
 @router.get("/list")
 async def list_subscribers(
-    params: Params = Depends(),
-) -> IGetResponseBase[List[SubscriberRead]]:
+    params: CursorParams = Depends(),
+) -> IGetResponseBase[CursorPage[SubscriberRead]]:
 
-    subscribers = await crud.subscriber.get_all()
+    subscribers = await crud.subscriber.get_multi_cursor(params=params)
     return create_response(data=subscribers)
 
 
@@ -69,6 +75,37 @@ async def create_subscriber(
     return create_response(data=created)
 
 
+@router.post("/import", status_code=status.HTTP_200_OK)
+async def import_subscribers(
+    request: Request,
+    format: Optional[SubscriberImportFormat] = None,
+    update_existing: bool = False,
+) -> IPostResponseBase[SubscriberImportResult]:
+    """
+    Bulk import from a streamed CSV (header with `email` and optional `name`)
+    or NDJSON request body. The body is read and written in batches as it
+    arrives; existing emails are skipped, or renamed with
+    `update_existing=true`. The format defaults to the Content-Type
+    (text/csv or application/x-ndjson).
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            format = SubscriberImportFormat.CSV
+        elif "json" in content_type:
+            format = SubscriberImportFormat.NDJSON
+        else:
+            return CustomException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                message="Send text/csv or application/x-ndjson, or pass ?format=",
+            ).get_response()
+
+    result = await SubscriberImport(update_existing=update_existing).run(
+        parse_rows(iter_lines(request.stream()), format)
+    )
+    return create_response(data=result)
+
+
 @router.put("/update/{subscriber_id}", status_code=status.HTTP_200_OK)
 async def update_subscriber(
     subscriber_id: UUID,
@@ -96,6 +133,13 @@ async def subscribe_to_topic(
     payload: SubscriptionCreate,
 ) -> IPostResponseBase[SubscriptionRead]:
 
+    created = await crud.subscription.subscribe(
+        subscriber_id=subscriber_id, topic_id=payload.topic_id
+    )
+    if created:
+        return create_response(data=created)
+
+    # Only failed subscribes pay for the lookups that explain why.
     subscriber = await crud.subscriber.get_by_id(id=subscriber_id)
     if not subscriber:
         return IdNotFoundException(Subscriber, subscriber_id).get_response()
@@ -107,23 +151,56 @@ async def subscribe_to_topic(
             message=f"Topic with id {payload.topic_id} not found.",
         ).get_response()
 
-    existing = await crud.subscription.get_for_subscriber(subscriber_id=subscriber_id)
-    if any(s.topic_id == payload.topic_id for s in existing):
+    return CustomException(
+        status_code=status.HTTP_409_CONFLICT,
+        message="Subscriber is already subscribed to this topic.",
+    ).get_response()
+
+
+@router.post("/bulk-subscribe", status_code=status.HTTP_200_OK)
+async def bulk_subscribe_to_topic(
+    payload: BulkSubscriptionRequest,
+) -> IPostResponseBase[BulkSubscribeResult]:
+    """
+    Subscribe many subscribers, given by id and/or email, to one topic in a
+    single set-wise statement.
+    """
+    topic = await crud.topic.get_by_id(id=payload.topic_id)
+    if not topic:
         return CustomException(
-            status_code=status.HTTP_409_CONFLICT,
-            message="Subscriber is already subscribed to this topic.",
+            status_code=status.HTTP_404_NOT_FOUND,
+            message=f"Topic with id {payload.topic_id} not found.",
         ).get_response()
 
-    created = await crud.subscription.create(
-        obj_in=(
-            payload
-            if getattr(payload, "subscriber_id", None)
-            else SubscriptionCreate(
-                subscriber_id=subscriber_id, topic_id=payload.topic_id
-            )
-        )
+    result = await crud.subscription.bulk_subscribe(
+        topic_id=payload.topic_id,
+        subscriber_ids=payload.subscriber_ids,
+        emails=payload.emails,
     )
-    return create_response(data=created)
+    return create_response(data=result)
+
+
+@router.post("/bulk-unsubscribe", status_code=status.HTTP_200_OK)
+async def bulk_unsubscribe_from_topic(
+    payload: BulkSubscriptionRequest,
+) -> IPostResponseBase[BulkUnsubscribeResult]:
+    """
+    Remove many subscribers, given by id and/or email, from one topic in a
+    single DELETE.
+    """
+    topic = await crud.topic.get_by_id(id=payload.topic_id)
+    if not topic:
+        return CustomException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            message=f"Topic with id {payload.topic_id} not found.",
+        ).get_response()
+
+    result = await crud.subscription.bulk_unsubscribe(
+        topic_id=payload.topic_id,
+        subscriber_ids=payload.subscriber_ids,
+        emails=payload.emails,
+    )
+    return create_response(data=result)
 
 
 @router.delete("/unsubscribe/{subscription_id}", status_code=status.HTTP_200_OK)
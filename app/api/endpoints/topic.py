@@ -2,11 +2,11 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
-from fastapi_pagination import Params
 
 from app import crud
 from app.models.topic_model import Topic
-from app.schemas.response_schema import (IDeleteResponseBase, IGetResponseBase,
+from app.schemas.response_schema import (CursorPage, CursorParams,
+                                         IDeleteResponseBase, IGetResponseBase,
                                          IPostResponseBase, IPutResponseBase,
                                          create_response)
 from app.schemas.topic_schema import TopicCreate, TopicRead, TopicUpdate
@@ -19,10 +19,10 @@ router = APIRouter()
 
 @router.get("/list")
 async def list_topics(
-    params: Params = Depends(),
-) -> IGetResponseBase[List[TopicRead]]:
+    params: CursorParams = Depends(),
+) -> IGetResponseBase[CursorPage[TopicRead]]:
 
-    topics = await crud.topic.get_all()
+    topics = await crud.topic.get_multi_cursor(params=params)
     return create_response(data=topics)
 
 
@@ -19,6 +19,15 @@ class Settings(BaseSettings):
     WEB_CONCURRENCY: int = 9
     POOL_SIZE: int = max(DB_POOL_SIZE // WEB_CONCURRENCY, 5)
     ASYNC_DATABASE_URI: PostgresDsn | str = ""
+    # Connection pools of the API's request sessions and of the engine used
+    # by scheduling and delivery (app.db.session), sized per tier.
+    API_DB_POOL_SIZE: int = 100
+    API_DB_MAX_OVERFLOW: int = 100
+    WORKER_DB_POOL_SIZE: int = 40
+    WORKER_DB_MAX_OVERFLOW: int = 20
+    # Port of the worker's Prometheus /metrics listener (0 disables it); the
+    # API serves /metrics itself.
+    WORKER_METRICS_PORT: int = 9100
 
     @field_validator("ASYNC_DATABASE_URI", mode="after")
     def assemble_db_connection(cls, v: str | None) -> Any:
@@ -38,6 +47,84 @@ class Settings(BaseSettings):
     ENCRYPT_KEY: str = os.environ["ENCRYPT_KEY"]
 
     EMAIL_CONNECTION_STRING: str = os.environ["EMAIL_CONNECTION_STRING"]
+    # "acs_async" uses the async ACS client, "thread" runs the sync client
+    # in a bounded thread pool of EMAIL_THREAD_POOL_SIZE workers.
+    EMAIL_TRANSPORT: str = "acs_async"
+    EMAIL_THREAD_POOL_SIZE: int = 20
+    EMAIL_MAX_CONNECTIONS: int = 50
+    EMAIL_TEMPLATE_CACHE_SIZE: int = 128
+    # Provider quota in send requests per second and the bounds of the
+    # adaptive in-flight limit behind it. Off (0) unless an operator sets it
+    # to the quota of their ACS resource.
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 0.0
+    EMAIL_RATE_LIMIT_BURST: int = 20
+    EMAIL_ADAPTIVE_INITIAL_CONCURRENCY: int = 10
+    EMAIL_ADAPTIVE_MIN_CONCURRENCY: int = 1
+    EMAIL_ADAPTIVE_MAX_CONCURRENCY: int = 50
+    EMAIL_ADAPTIVE_LATENCY_FACTOR: float = 2.0
+    # Batch mode sends one BCC message per EMAIL_BATCH_SIZE recipients
+    # (ACS accepts at most 50) and greets everyone with the same name.
+    EMAIL_BATCH_MODE: bool = False
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_BATCH_GREETING_NAME: str = "there"
+
+    @field_validator("EMAIL_BATCH_SIZE", mode="after")
+    def check_email_batch_size(cls, v: int) -> int:
+        if not 1 <= v <= 50:
+            raise ValueError("EMAIL_BATCH_SIZE must be between 1 and 50 (ACS limit)")
+        return v
+
+    # Run scheduling and delivery inside the API process. Turn off when
+    # `python -m app.worker` processes do the sending.
+    RUN_SCHEDULER: bool = True
+    # With leader election on, only the process holding the Postgres
+    # advisory lock SCHEDULER_LOCK_KEY runs the scheduler.
+    SCHEDULER_LEADER_ELECTION: bool = True
+    SCHEDULER_LOCK_KEY: int = 727130417
+    SCHEDULER_LEADER_RETRY_SECONDS: float = 10.0
+    # Must exceed the 10 minute refresh interval so no due content is missed.
+    SCHEDULER_LOOKAHEAD_MINUTES: int = 30
+    SCHEDULER_REFRESH_OVERLAP_SECONDS: int = 60
+    SCHEDULE_LISTENER_RECONNECT_SECONDS: float = 5.0
+    # "memory" keeps APScheduler jobs in the process; the refresh rebuilds
+    # them after a restart. "sqlalchemy" persists them in Postgres through a
+    # synchronous driver, so job store access blocks the event loop.
+    SCHEDULER_JOBSTORE: str = "memory"
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 3600
+    # "apscheduler" registers one DateTrigger job per content; "wheel" keeps
+    # due contents in an in-memory timing wheel and dispatches them per tick.
+    SCHEDULER_DISPATCHER: str = "apscheduler"
+    SCHEDULER_WHEEL_TICK_SECONDS: float = 1.0
+    SCHEDULER_WHEEL_SLOTS: int = 3600
+
+    # A "sending" content whose claim is not renewed for this long is
+    # considered abandoned and can be claimed again.
+    CONTENT_SENDING_LEASE_SECONDS: int = 900
+    DELIVERY_CONCURRENCY: int = 20
+    DELIVERY_RECIPIENT_CHUNK_SIZE: int = 1000
+    DELIVERY_LOG_BUFFER_SIZE: int = 500
+    DELIVERY_LOG_FLUSH_INTERVAL: float = 2.0
+    # Failed sends are logged as "retrying" with a due time (exponential
+    # backoff, full jitter) and picked up by every worker's retry poller;
+    # RETRY_MAX_ATTEMPTS includes the first send.
+    RETRY_MAX_ATTEMPTS: int = 5
+    RETRY_BASE_DELAY_SECONDS: float = 30.0
+    RETRY_THROTTLED_BASE_DELAY_SECONDS: float = 120.0
+    RETRY_MAX_DELAY_SECONDS: float = 3600.0
+    RETRY_POLL_SECONDS: float = 5.0
+    RETRY_CLAIM_BATCH_SIZE: int = 500
+    # A claimed retry that is not resent within this long is due again.
+    RETRY_LEASE_SECONDS: int = 600
+    # Rows per INSERT ... ON CONFLICT batch of the bulk subscriber import.
+    SUBSCRIBER_IMPORT_BATCH_SIZE: int = 5000
+    # Rows fetched per server-side cursor batch by the delivery log export.
+    DELIVERY_LOG_EXPORT_BATCH_SIZE: int = 1000
+    # Outbox mode persists each (content, subscriber) delivery as a row that
+    # any process can claim, so a fan-out survives crashes and scales out.
+    DELIVERY_USE_OUTBOX: bool = False
+    OUTBOX_CLAIM_BATCH_SIZE: int = 500
+    OUTBOX_LEASE_SECONDS: int = 600
+    OUTBOX_POLL_SECONDS: int = 30
 
 
 settings = Settings()
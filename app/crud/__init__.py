@@ -1,5 +1,6 @@
 from .content_crud import content
 from .delivery_log_crud import delivery_log
+from .delivery_outbox_crud import delivery_outbox
 from .subscriber_crud import subscriber
 from .subscription_crud import subscription
 from .topic_crud import topic
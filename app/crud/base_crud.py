@@ -1,3 +1,5 @@
+import base64
+import json
 from typing import Any, Generic, TypeVar
 from uuid import UUID
 
@@ -13,6 +15,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql.expression import Select
 
 from app.schemas.common_schema import IOrderEnum
+from app.schemas.response_schema import CursorPage, CursorParams
 from app.utils.exceptions.common_exceptions import (CustomException,
                                                     ProcessError)
 
@@ -94,6 +97,47 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         output = await paginate(db_session, query, params)
         return output
 
+    @staticmethod
+    def encode_cursor(last_id: UUID | str) -> str:
+        raw = json.dumps({"id": str(last_id)}).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> UUID:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            return UUID(json.loads(base64.urlsafe_b64decode(padded))["id"])
+        except (ValueError, KeyError, TypeError):
+            raise CustomException(status_code=400, message="Invalid page cursor")
+
+    async def get_multi_cursor(
+        self,
+        *,
+        params: CursorParams,
+        query: T | Select[T] | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> CursorPage[ModelType]:
+        """
+        Keyset pagination on the primary key: each page is
+        `WHERE id > <last id> ORDER BY id LIMIT size + 1` on the id index,
+        so every page costs the same however deep it is. `query` may add
+        filters but must not set its own ordering or limit.
+        """
+        db_session = db_session or self.db.session
+        if query is None:
+            query = select(self.model)
+        if params.cursor:
+            query = query.where(self.model.id > self.decode_cursor(params.cursor))
+        query = query.order_by(self.model.id).limit(params.size + 1)
+
+        response = await db_session.execute(query)
+        items = response.scalars().all()
+        next_cursor = None
+        if len(items) > params.size:
+            items = items[: params.size]
+            next_cursor = self.encode_cursor(items[-1].id)
+        return CursorPage(items=items, size=params.size, next_cursor=next_cursor)
+
     async def get_multi_paginated_ordered(
         self,
         *,
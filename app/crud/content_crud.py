@@ -1,13 +1,47 @@
-from datetime import datetime, timezone
-from typing import List, Optional
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
 from uuid import UUID
 
-from sqlmodel import and_, select
+from sqlalchemy import case, exists, update
+from sqlmodel import and_, or_, select, text
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base_crud import CRUDBase
+from app.core.config import settings
 from app.models.content_model import Content
-from app.schemas.content_schema import ContentCreate, ContentUpdate
+from app.models.delivery_log_model import DeliveryLog
+from app.schemas.content_schema import (ContentCreate, ContentStatus,
+                                        ContentUpdate)
+
+
+# Postgres NOTIFY channel the scheduler LISTENs on for schedule changes.
+SCHEDULE_CHANNEL = "content_schedule"
+
+# Same predicate as the partial index on Content.scheduled_time. It is kept as
+# literal SQL so the planner can match it even under a generic prepared plan.
+PENDING = text("\"Content\".status IN ('scheduled', 'sending')")
+
+
+def claimable():
+    """
+    Clause for contents that may be picked up for sending: scheduled ones,
+    and ones stuck in "sending" whose lease ran out because the sending
+    process died.
+    """
+    return and_(
+        PENDING,
+        or_(
+            Content.status == ContentStatus.SCHEDULED.value,
+            Content.lease_expires_at < datetime.utcnow(),
+        ),
+    )
+
+
+def _has_deliveries(status: str):
+    return exists().where(
+        and_(DeliveryLog.content_id == Content.id, DeliveryLog.status == status)
+    )
 
 
 class CRUDContent(CRUDBase[Content, ContentCreate, ContentUpdate]):
@@ -40,20 +74,21 @@ class CRUDContent(CRUDBase[Content, ContentCreate, ContentUpdate]):
         )
         return result.scalars().all()
 
+    def pending_query(self, *, as_of: datetime | None = None):
+        as_of = self._ensure_aware_utc(as_of or datetime.now(timezone.utc))
+        return select(Content).where(
+            and_(claimable(), Content.scheduled_time <= as_of)
+        )
+
     async def get_pending_to_send(
         self, *, as_of: datetime | None = None, db_session: AsyncSession | None = None
     ) -> List[Content]:
         """
-        Return contents scheduled to be sent at or before `as_of` and not yet marked sent.
-        Default `as_of` is now (UTC).
+        Return contents scheduled to be sent at or before `as_of` and not yet
+        claimed for sending. Default `as_of` is now (UTC).
         """
         db_session = db_session or super().get_db().session
-        as_of = as_of or datetime.now(timezone.utc)
-        as_of = self._ensure_aware_utc(as_of)
-        stmt = select(Content).where(
-            and_(Content.sent == False, Content.scheduled_time <= as_of)
-        )
-        result = await db_session.execute(stmt)
+        result = await db_session.execute(self.pending_query(as_of=as_of))
         return result.scalars().all()
 
     async def get_scheduled_between(
@@ -68,17 +103,266 @@ class CRUDContent(CRUDBase[Content, ContentCreate, ContentUpdate]):
         result = await db_session.execute(stmt)
         return result.scalars().all()
 
-    async def mark_sent(
-        self, *, id: UUID, db_session: AsyncSession | None = None
+    async def get_schedule_candidates(
+        self,
+        *,
+        now: datetime,
+        window_end: datetime,
+        previous_window_end: datetime | None = None,
+        changed_since: datetime | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> List[Any]:
+        """
+        Return (id, scheduled_time) of claimable contents due before `window_end`
+        that the scheduler may need to (re)register: everything overdue, plus
+        rows that entered the window since `previous_window_end`. Rows
+        updated after `changed_since` are returned wherever they are
+        scheduled, so the caller can drop jobs of contents moved past the
+        window. Without a previous refresh, every claimable row in the
+        window is returned. Bodies are never loaded, and
+        the partial index on pending scheduled_time keeps the scan
+        proportional to pending work rather than history.
+        """
+        db_session = db_session or super().get_db().session
+        now = self._ensure_aware_utc(now)
+        window_end = self._ensure_aware_utc(window_end)
+        in_window = Content.scheduled_time <= window_end
+        stmt = select(Content.id, Content.scheduled_time).where(claimable())
+        if previous_window_end is not None and changed_since is not None:
+            stmt = stmt.where(
+                or_(
+                    and_(
+                        in_window,
+                        or_(
+                            Content.scheduled_time <= now,
+                            Content.scheduled_time
+                            > self._ensure_aware_utc(previous_window_end),
+                        ),
+                    ),
+                    # Also outside the window, so jobs of contents moved
+                    # past it can be dropped.
+                    Content.updated_at > changed_since,
+                )
+            )
+        else:
+            stmt = stmt.where(in_window)
+        result = await db_session.execute(stmt)
+        return result.all()
+
+    async def get_due_unsent_ids(
+        self,
+        *,
+        ids: List[UUID | str],
+        as_of: datetime,
+        db_session: AsyncSession | None = None,
+    ) -> List[UUID]:
+        """
+        Of `ids`, return those still claimable and scheduled at or before
+        `as_of`.
+        """
+        if not ids:
+            return []
+        db_session = db_session or super().get_db().session
+        as_of = self._ensure_aware_utc(as_of)
+        result = await db_session.execute(
+            select(Content.id).where(
+                and_(
+                    Content.id.in_(ids),
+                    claimable(),
+                    Content.scheduled_time <= as_of,
+                )
+            )
+        )
+        return result.scalars().all()
+
+    def _lease_expiry(self, lease_seconds: int | None = None) -> datetime:
+        lease_seconds = lease_seconds or settings.CONTENT_SENDING_LEASE_SECONDS
+        return datetime.utcnow() + timedelta(seconds=lease_seconds)
+
+    async def claim_for_sending(
+        self,
+        *,
+        id: UUID | str,
+        lease_seconds: int | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> Optional[Content]:
+        """
+        Move a claimable content to "sending" with a lease of `lease_seconds`
+        and return it, or return None if it is missing, not due yet, finished
+        or already being sent by someone else. The returned row saves a separate SELECT.
+        """
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            update(Content)
+            .where(
+                and_(
+                    Content.id == id,
+                    claimable(),
+                    # A stale job for a content moved later must not send it.
+                    Content.scheduled_time <= datetime.now(timezone.utc),
+                )
+            )
+            .values(
+                status=ContentStatus.SENDING.value,
+                lease_expires_at=self._lease_expiry(lease_seconds),
+                # The lease is not an edit: keep updated_at, which the refresh
+                # high-water mark and the template cache key on.
+                updated_at=Content.updated_at,
+            )
+            .returning(Content)
+            .execution_options(synchronize_session=False)
+        )
+        obj = result.scalar_one_or_none()
+        await db_session.commit()
+        return obj
+
+    async def renew_claim(
+        self,
+        *,
+        id: UUID | str,
+        lease_seconds: int | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> bool:
+        """
+        Push the sending lease forward; False means the claim was lost.
+        """
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            update(Content)
+            .where(
+                and_(Content.id == id, Content.status == ContentStatus.SENDING.value)
+            )
+            .values(
+                lease_expires_at=self._lease_expiry(lease_seconds),
+                updated_at=Content.updated_at,
+            )
+            .returning(Content.id)
+            .execution_options(synchronize_session=False)
+        )
+        renewed = result.first() is not None
+        await db_session.commit()
+        return renewed
+
+    async def release_claim(
+        self, *, id: UUID | str, db_session: AsyncSession | None = None
+    ) -> bool:
+        """
+        Hand a content that is being sent back to the scheduler.
+        """
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            update(Content)
+            .where(
+                and_(Content.id == id, Content.status == ContentStatus.SENDING.value)
+            )
+            .values(
+                status=ContentStatus.SCHEDULED.value,
+                lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(Content.id)
+            .execution_options(synchronize_session=False)
+        )
+        released = result.first() is not None
+        await db_session.commit()
+        return released
+
+    async def finish_sending(
+        self, *, id: UUID | str, db_session: AsyncSession | None = None
+    ) -> Optional[str]:
+        """
+        Close a "sending" content once its fan-out is done, in a single
+        statement: "partially_failed" when any delivery failed for good,
+        "sent" otherwise. While deliveries are still being retried the
+        content stays "sending" with its lease cleared, so it cannot be
+        claimed again, and settle_retried() closes it later.
+        Returns the new status, or None if the content was not sending.
+        """
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            update(Content)
+            .where(
+                and_(Content.id == id, Content.status == ContentStatus.SENDING.value)
+            )
+            .values(
+                status=case(
+                    (_has_deliveries("retrying"), ContentStatus.SENDING.value),
+                    (_has_deliveries("failed"), ContentStatus.PARTIALLY_FAILED.value),
+                    else_=ContentStatus.SENT.value,
+                ),
+                lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+            )
+            .returning(Content.status)
+            .execution_options(synchronize_session=False)
+        )
+        status = result.scalar_one_or_none()
+        await db_session.commit()
+        return status
+
+    async def settle_retried(
+        self, *, ids: List[UUID | str], db_session: AsyncSession | None = None
+    ) -> List[Any]:
+        """
+        Close the contents among `ids` whose fan-out finished while retries
+        were pending (status "sending" without a lease) and that have no
+        delivery left to retry. Returns their (id, status).
+        """
+        if not ids:
+            return []
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            update(Content)
+            .where(
+                and_(
+                    Content.id.in_(ids),
+                    Content.status == ContentStatus.SENDING.value,
+                    Content.lease_expires_at.is_(None),
+                    ~_has_deliveries("retrying"),
+                )
+            )
+            .values(
+                status=case(
+                    (_has_deliveries("failed"), ContentStatus.PARTIALLY_FAILED.value),
+                    else_=ContentStatus.SENT.value,
+                ),
+                updated_at=datetime.utcnow(),
+            )
+            .returning(Content.id, Content.status)
+            .execution_options(synchronize_session=False)
+        )
+        settled = result.all()
+        await db_session.commit()
+        return settled
+
+    async def notify_schedule_change(
+        self,
+        *,
+        id: UUID,
+        action: str,
+        scheduled_time: datetime | None = None,
+        db_session: AsyncSession | None = None,
     ) -> None:
+        """
+        Emit a NOTIFY on SCHEDULE_CHANNEL so the scheduler can add, move
+        ("schedule") or drop ("unschedule") the content's job right away.
+        """
         db_session = db_session or super().get_db().session
-        obj = await self.get_by_id(id=id, db_session=db_session)
-        if not obj:
-            return
-        obj.sent = True
-        db_session.add(obj)
+        scheduled_time = self._ensure_aware_utc(scheduled_time)
+        payload = json.dumps(
+            {
+                "action": action,
+                "content_id": str(id),
+                "scheduled_time": scheduled_time.isoformat()
+                if scheduled_time
+                else None,
+            }
+        )
+        await db_session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": SCHEDULE_CHANNEL, "payload": payload},
+        )
         await db_session.commit()
-        await db_session.refresh(obj)
 
     async def get_all(self, db_session: AsyncSession | None = None) -> List[Content]:
         db_session = db_session or super().get_db().session
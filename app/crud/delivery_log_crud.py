@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any, List, Optional
-from uuid import UUID
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+from uuid import UUID, uuid4
 
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import and_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base_crud import CRUDBase
 from app.models.delivery_log_model import DeliveryLog
+from app.models.subscriber_model import Subscriber
 from app.schemas.delivery_log_schema import (DeliveryLogCreate,
                                              DeliveryLogUpdate)
 
@@ -24,6 +27,27 @@ class CRUDDeliveryLog(CRUDBase[DeliveryLog, DeliveryLogCreate, DeliveryLogUpdate
         )
         return result.scalar_one_or_none()
 
+    async def get_for_delivery(
+        self,
+        *,
+        content_id: UUID | str,
+        subscriber_id: UUID | str,
+        db_session: AsyncSession | None = None,
+    ) -> Optional[DeliveryLog]:
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            select(DeliveryLog)
+            .where(
+                and_(
+                    DeliveryLog.content_id == content_id,
+                    DeliveryLog.subscriber_id == subscriber_id,
+                )
+            )
+            .order_by(DeliveryLog.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
     async def list_for_content(
         self, *, content_id: UUID, db_session: AsyncSession | None = None
     ) -> List[DeliveryLog]:
@@ -42,6 +66,56 @@ class CRUDDeliveryLog(CRUDBase[DeliveryLog, DeliveryLogCreate, DeliveryLogUpdate
         )
         return result.scalars().all()
 
+    async def stream_for_export(
+        self,
+        *,
+        content_id: UUID | None = None,
+        statuses: Sequence[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+        db_session: AsyncSession,
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Yield the matching delivery logs, joined with the subscriber's email,
+        in batches of up to `batch_size` plain rows read from a server-side
+        cursor, so memory stays bounded by one batch whatever the total.
+        `since`/`until` filter on the time of the latest attempt (updated_at).
+
+        The cursor lives in a transaction on `db_session`, which must stay
+        open until iteration ends.
+        """
+        stmt = select(
+            DeliveryLog.id,
+            DeliveryLog.content_id,
+            DeliveryLog.subscriber_id,
+            Subscriber.email,
+            DeliveryLog.status,
+            DeliveryLog.attempts,
+            DeliveryLog.error,
+            DeliveryLog.sent_at,
+            DeliveryLog.created_at,
+            DeliveryLog.updated_at,
+        ).join(Subscriber, Subscriber.id == DeliveryLog.subscriber_id)
+        if content_id is not None:
+            # Walks the (content_id, subscriber_id) unique index, so rows
+            # come back in order without a sort delaying the first one.
+            stmt = stmt.where(DeliveryLog.content_id == content_id).order_by(
+                DeliveryLog.subscriber_id
+            )
+        if statuses:
+            stmt = stmt.where(DeliveryLog.status.in_(list(statuses)))
+        if since is not None:
+            stmt = stmt.where(DeliveryLog.updated_at >= since)
+        if until is not None:
+            stmt = stmt.where(DeliveryLog.updated_at < until)
+
+        result = await db_session.stream(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
     async def create_log(
         self,
         *,
@@ -64,5 +138,118 @@ class CRUDDeliveryLog(CRUDBase[DeliveryLog, DeliveryLogCreate, DeliveryLogUpdate
         await db_session.refresh(obj)
         return obj
 
+    async def create_logs_bulk(
+        self,
+        *,
+        rows: List[Dict[str, Any]],
+        db_session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Upsert many delivery outcomes in one multi-row INSERT and a single
+        commit. Each row needs content_id, subscriber_id, status and may carry
+        error, attempts, sent_at and next_attempt_at. An existing row for the
+        same delivery is updated unless it is already "sent". Returns the
+        number of rows submitted.
+        """
+        if not rows:
+            return 0
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        # ON CONFLICT cannot touch the same row twice in one statement, so
+        # keep only the last outcome per delivery.
+        latest = {(row["content_id"], row["subscriber_id"]): row for row in rows}
+        values = [
+            {
+                "id": uuid4(),
+                "content_id": row["content_id"],
+                "subscriber_id": row["subscriber_id"],
+                "status": row["status"],
+                "error": row.get("error"),
+                "attempts": row.get("attempts", 1),
+                "sent_at": row.get("sent_at") or now,
+                "next_attempt_at": row.get("next_attempt_at"),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in latest.values()
+        ]
+        stmt = insert(DeliveryLog)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_DeliveryLog_content_subscriber",
+            set_={
+                "status": stmt.excluded.status,
+                "error": stmt.excluded.error,
+                "attempts": stmt.excluded.attempts,
+                "sent_at": stmt.excluded.sent_at,
+                "next_attempt_at": stmt.excluded.next_attempt_at,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=DeliveryLog.status != "sent",
+        )
+        try:
+            await db_session.execute(stmt, values)
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+        return len(values)
+
+    async def claim_due_retries(
+        self,
+        *,
+        limit: int,
+        lease_seconds: int,
+        db_session: AsyncSession | None = None,
+    ) -> List[Any]:
+        """
+        Claim up to `limit` "retrying" deliveries whose next_attempt_at has
+        passed, oldest first.
+
+        Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED and their
+        next_attempt_at is pushed `lease_seconds` ahead, so concurrent
+        workers never claim the same row and a worker that dies mid-retry
+        only delays it. Each returned row carries content_id, attempts and
+        the subscriber's id, email and name.
+        """
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        candidates = (
+            select(DeliveryLog.id)
+            .where(
+                and_(
+                    DeliveryLog.status == "retrying",
+                    DeliveryLog.next_attempt_at <= now,
+                )
+            )
+            .order_by(DeliveryLog.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        # Core tables, as in the outbox claim, so RETURNING keeps the joined
+        # Subscriber columns.
+        log_table = DeliveryLog.__table__
+        subscriber_table = Subscriber.__table__
+        stmt = (
+            update(log_table)
+            .where(log_table.c.id.in_(candidates.scalar_subquery()))
+            .where(subscriber_table.c.id == log_table.c.subscriber_id)
+            .values(
+                next_attempt_at=now + timedelta(seconds=lease_seconds),
+                updated_at=now,
+            )
+            .returning(
+                log_table.c.content_id,
+                log_table.c.attempts,
+                subscriber_table.c.id,
+                subscriber_table.c.email,
+                subscriber_table.c.name,
+            )
+        )
+        result = await db_session.execute(stmt)
+        rows = result.all()
+        await db_session.commit()
+        return rows
+
 
 delivery_log = CRUDDeliveryLog(DeliveryLog)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+from uuid import UUID
+
+from sqlalchemy import delete, func, literal, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import and_, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base_crud import CRUDBase
+from app.crud.subscription_crud import already_attempted
+from app.models.delivery_outbox_model import DeliveryOutbox
+from app.models.subscriber_model import Subscriber
+from app.models.subscription_model import Subscription
+from app.schemas.delivery_outbox_schema import (DeliveryOutboxCreate,
+                                                DeliveryOutboxUpdate,
+                                                OutboxStatus)
+
+
+class CRUDDeliveryOutbox(
+    CRUDBase[DeliveryOutbox, DeliveryOutboxCreate, DeliveryOutboxUpdate]
+):
+
+    async def enqueue_for_content(
+        self,
+        *,
+        content_id: UUID,
+        topic_id: UUID,
+        db_session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Create one pending row per subscriber of the topic with a single
+        INSERT ... SELECT. Rows already enqueued and subscribers that already
+        have a delivery log for the content are skipped, so calling this
+        again for the same content is safe. Returns the rows inserted.
+        """
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        source = select(
+            func.gen_random_uuid(),
+            literal(content_id),
+            Subscription.subscriber_id,
+            literal(OutboxStatus.PENDING.value),
+            literal(now),
+            literal(now),
+        ).where(
+            and_(
+                Subscription.topic_id == topic_id,
+                ~already_attempted(content_id, Subscription.subscriber_id),
+            )
+        )
+        stmt = (
+            insert(DeliveryOutbox)
+            .from_select(
+                [
+                    "id",
+                    "content_id",
+                    "subscriber_id",
+                    "status",
+                    "created_at",
+                    "updated_at",
+                ],
+                source,
+            )
+            .on_conflict_do_nothing(
+                index_elements=["content_id", "subscriber_id"]
+            )
+        )
+        result = await db_session.execute(stmt)
+        await db_session.commit()
+        return result.rowcount
+
+    async def claim_batch(
+        self,
+        *,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        content_id: UUID | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> List[Any]:
+        """
+        Claim up to `limit` pending rows for `worker_id`.
+
+        Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+        workers never claim the same row. Claims older than `lease_seconds`
+        are treated as abandoned by a crashed worker and can be claimed again.
+        Each returned row carries outbox_id, content_id, the subscriber's id,
+        email and name, and `attempted`: true when a DeliveryLog already
+        records an outcome for that delivery, e.g. because a worker crashed
+        after logging it but before removing the row. Such rows must be
+        removed without sending again; retries belong to the retry poller.
+        """
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=lease_seconds)
+
+        claimable = or_(
+            DeliveryOutbox.status == OutboxStatus.PENDING.value,
+            and_(
+                DeliveryOutbox.status == OutboxStatus.CLAIMED.value,
+                DeliveryOutbox.claimed_at < stale_before,
+            ),
+        )
+        candidates = select(DeliveryOutbox.id).where(claimable)
+        if content_id is not None:
+            candidates = candidates.where(DeliveryOutbox.content_id == content_id)
+        candidates = (
+            candidates.order_by(DeliveryOutbox.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        # Core tables are used here because ORM-enabled UPDATE drops RETURNING
+        # columns that belong to the joined Subscriber table.
+        outbox_table = DeliveryOutbox.__table__
+        subscriber_table = Subscriber.__table__
+        stmt = (
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(candidates.scalar_subquery()))
+            .where(subscriber_table.c.id == outbox_table.c.subscriber_id)
+            .values(
+                status=OutboxStatus.CLAIMED.value,
+                claimed_by=worker_id,
+                claimed_at=now,
+                updated_at=now,
+            )
+            .returning(
+                outbox_table.c.id.label("outbox_id"),
+                outbox_table.c.content_id,
+                subscriber_table.c.id,
+                subscriber_table.c.email,
+                subscriber_table.c.name,
+                already_attempted(
+                    outbox_table.c.content_id, outbox_table.c.subscriber_id
+                ).label("attempted"),
+            )
+        )
+        result = await db_session.execute(stmt)
+        rows = result.all()
+        await db_session.commit()
+        return rows
+
+    async def remove_many(
+        self, *, ids: List[UUID], db_session: AsyncSession | None = None
+    ) -> None:
+        if not ids:
+            return
+        db_session = db_session or super().get_db().session
+        await db_session.execute(
+            delete(DeliveryOutbox).where(DeliveryOutbox.id.in_(ids))
+        )
+        await db_session.commit()
+
+    async def count_for_content(
+        self, *, content_id: UUID, db_session: AsyncSession | None = None
+    ) -> int:
+        """
+        Number of rows for the content that are still pending or claimed.
+        """
+        db_session = db_session or super().get_db().session
+        result = await db_session.execute(
+            select(func.count())
+            .select_from(DeliveryOutbox)
+            .where(DeliveryOutbox.content_id == content_id)
+        )
+        return result.scalar_one()
+
+
+delivery_outbox = CRUDDeliveryOutbox(DeliveryOutbox)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, List, Optional
-from uuid import UUID
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
 
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import and_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -35,5 +37,56 @@ class CRUDSubscriber(CRUDBase[Subscriber, SubscriberCreate, SubscriberUpdate]):
         result = await db_session.execute(select(Subscriber))
         return result.scalars().all()
 
+    async def upsert_many(
+        self,
+        *,
+        rows: List[Dict[str, Any]],
+        update_existing: bool = False,
+        db_session: AsyncSession | None = None,
+    ) -> Dict[str, str]:
+        """
+        Write a batch of {"email", "name"} rows with INSERT ... ON CONFLICT
+        (email) and one commit. Existing subscribers are left alone, or get
+        the new name with `update_existing`. Emails must be unique within the
+        batch. Returns {email: "created" | "updated"} for the rows written;
+        emails missing from it already existed and were not touched.
+        """
+        if not rows:
+            return {}
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        values = [
+            {
+                "id": uuid4(),
+                "email": row["email"],
+                "name": row.get("name"),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in rows
+        ]
+        table = Subscriber.__table__
+        stmt = insert(table)
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["email"],
+                set_={"name": stmt.excluded.name, "updated_at": now},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["email"])
+        # xmax is 0 only for rows this statement inserted.
+        stmt = stmt.returning(table.c.email, literal_column("xmax = 0"))
+        try:
+            result = await db_session.execute(stmt, values)
+            written = {
+                email: "created" if inserted else "updated"
+                for email, inserted in result.all()
+            }
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+        return written
+
 
 subscriber = CRUDSubscriber(Subscriber)
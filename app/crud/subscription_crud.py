@@ -1,19 +1,41 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import any_, bindparam, delete, exists, func, literal, or_
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.types import String
 from sqlmodel import and_, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base_crud import CRUDBase
+from app.metrics import stage_seconds
+from app.models.delivery_log_model import DeliveryLog
 from app.models.subscriber_model import Subscriber
 from app.models.subscription_model import Subscription
+from app.models.topic_model import Topic
 from app.schemas.subscription_schema import (SubscriptionCreate,
                                              SubscriptionUpdate)
 
 
+def already_attempted(content_id: UUID, subscriber_id_column: Any):
+    """
+    EXISTS clause that is true when the subscriber in `subscriber_id_column`
+    already has a DeliveryLog row for `content_id`: sent, failed for good, or
+    owned by the retry poller. Negate it for an anti-join, so a resumed
+    fan-out never sends to those subscribers again.
+    """
+    return exists().where(
+        and_(
+            DeliveryLog.content_id == content_id,
+            DeliveryLog.subscriber_id == subscriber_id_column,
+        )
+    )
+
+
 class CRUDSubscription(CRUDBase[Subscription, SubscriptionCreate, SubscriptionUpdate]):
 
     async def get_by_id(
@@ -25,6 +47,42 @@ class CRUDSubscription(CRUDBase[Subscription, SubscriptionCreate, SubscriptionUp
         )
         return result.scalar_one_or_none()
 
+    async def subscribe(
+        self,
+        *,
+        subscriber_id: UUID,
+        topic_id: UUID,
+        db_session: AsyncSession | None = None,
+    ) -> Optional[Subscription]:
+        """
+        Create the subscription with one INSERT ... SELECT ... ON CONFLICT DO
+        NOTHING RETURNING, safe under concurrent requests. The SELECT joins
+        the subscriber and topic, so None means one of them does not exist
+        or the subscription already does.
+        """
+        db_session = db_session or super().get_db().session
+        now = datetime.utcnow()
+        source = select(
+            func.gen_random_uuid(),
+            Subscriber.id,
+            Topic.id,
+            literal(now),
+            literal(now),
+        ).where(and_(Subscriber.id == subscriber_id, Topic.id == topic_id))
+        table = Subscription.__table__
+        result = await db_session.execute(
+            insert(table)
+            .from_select(
+                ["id", "subscriber_id", "topic_id", "created_at", "updated_at"],
+                source,
+            )
+            .on_conflict_do_nothing(constraint="uq_Subscription_subscriber_topic")
+            .returning(*table.c)
+        )
+        row = result.first()
+        await db_session.commit()
+        return Subscription(**row._mapping) if row else None
+
     async def get_for_subscriber(
         self, *, subscriber_id: UUID, db_session: AsyncSession | None = None
     ) -> List[Subscription]:
@@ -56,5 +114,178 @@ class CRUDSubscription(CRUDBase[Subscription, SubscriptionCreate, SubscriptionUp
         result = await db_session.execute(stmt)
         return result.scalars().all()
 
+    async def iter_subscribers_for_topic(
+        self,
+        *,
+        topic_id: UUID,
+        chunk_size: int = 1000,
+        undelivered_content_id: UUID | None = None,
+        db_session: AsyncSession | None = None,
+    ) -> AsyncIterator[Subscriber]:
+        """
+        Yield the topic's subscribers one by one, fetched in pages of
+        `chunk_size` ordered by subscriber id (keyset pagination on the
+        (topic_id, subscriber_id) index), so only one page is held in memory
+        at a time.
+
+        With `undelivered_content_id`, subscribers that already have any
+        DeliveryLog row for that content are left out, so a restarted fan-out
+        only covers recipients never attempted; retries stay with the retry
+        poller.
+        """
+        db_session = db_session or super().get_db().session
+        last_id: Optional[UUID] = None
+        while True:
+            # Ordering and filtering on Subscription.subscriber_id lets each
+            # page start where the last one ended on the (topic_id,
+            # subscriber_id) index instead of re-sorting the whole topic.
+            stmt = (
+                select(Subscriber)
+                .join(Subscription, Subscription.subscriber_id == Subscriber.id)
+                .where(Subscription.topic_id == topic_id)
+                .order_by(Subscription.subscriber_id)
+                .limit(chunk_size)
+            )
+            if undelivered_content_id is not None:
+                stmt = stmt.where(
+                    ~already_attempted(
+                        undelivered_content_id, Subscription.subscriber_id
+                    )
+                )
+            if last_id is not None:
+                stmt = stmt.where(Subscription.subscriber_id > last_id)
+            with stage_seconds.labels("scheduler", "subscriber_page").time():
+                result = await db_session.execute(stmt)
+                page = result.scalars().all()
+            if not page:
+                return
+            for subscriber in page:
+                yield subscriber
+            if len(page) < chunk_size:
+                return
+            last_id = page[-1].id
+            # Drop the page from the identity map so memory stays bounded.
+            db_session.expunge_all()
+
+    async def _match_subscribers(
+        self,
+        *,
+        subscriber_ids: List[UUID],
+        emails: List[str],
+        db_session: AsyncSession,
+    ) -> tuple[Any, Dict[str, int]]:
+        """
+        Build the SELECT of subscriber ids named by `subscriber_ids` or
+        `emails` (each passed as one array parameter, whatever its length)
+        and count requested, matched and missing identifiers in one query.
+        """
+        ids = list(dict.fromkeys(subscriber_ids))
+        emails = list(dict.fromkeys(emails))
+        id_match = Subscriber.id == any_(
+            bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+        )
+        email_match = Subscriber.email == any_(
+            bindparam("emails", emails, type_=ARRAY(String))
+        )
+        matched = select(Subscriber.id).where(or_(id_match, email_match))
+
+        counts = (
+            await db_session.execute(
+                select(
+                    select(func.count())
+                    .select_from(matched.subquery())
+                    .scalar_subquery(),
+                    select(func.count())
+                    .where(id_match)
+                    .select_from(Subscriber)
+                    .scalar_subquery(),
+                    select(func.count())
+                    .where(email_match)
+                    .select_from(Subscriber)
+                    .scalar_subquery(),
+                )
+            )
+        ).one()
+        requested = len(ids) + len(emails)
+        return matched, {
+            "requested": requested,
+            "matched": counts[0],
+            "missing": requested - counts[1] - counts[2],
+        }
+
+    async def bulk_subscribe(
+        self,
+        *,
+        topic_id: UUID,
+        subscriber_ids: List[UUID],
+        emails: List[str],
+        db_session: AsyncSession | None = None,
+    ) -> Dict[str, int]:
+        """
+        Subscribe every subscriber named by id or email to the topic with one
+        INSERT ... SELECT ... ON CONFLICT DO NOTHING, so existing (and
+        concurrently created) subscriptions are skipped.
+        """
+        db_session = db_session or super().get_db().session
+        matched, counts = await self._match_subscribers(
+            subscriber_ids=subscriber_ids, emails=emails, db_session=db_session
+        )
+        now = datetime.utcnow()
+        candidates = matched.subquery()
+        source = select(
+            func.gen_random_uuid(),
+            candidates.c.id,
+            literal(topic_id),
+            literal(now),
+            literal(now),
+        )
+        result = await db_session.execute(
+            insert(Subscription)
+            .from_select(
+                ["id", "subscriber_id", "topic_id", "created_at", "updated_at"],
+                source,
+            )
+            .on_conflict_do_nothing(constraint="uq_Subscription_subscriber_topic")
+        )
+        await db_session.commit()
+        return {
+            "requested": counts["requested"],
+            "added": result.rowcount,
+            "already_present": counts["matched"] - result.rowcount,
+            "missing": counts["missing"],
+        }
+
+    async def bulk_unsubscribe(
+        self,
+        *,
+        topic_id: UUID,
+        subscriber_ids: List[UUID],
+        emails: List[str],
+        db_session: AsyncSession | None = None,
+    ) -> Dict[str, int]:
+        """
+        Remove the topic subscriptions of every subscriber named by id or
+        email with one DELETE.
+        """
+        db_session = db_session or super().get_db().session
+        matched, counts = await self._match_subscribers(
+            subscriber_ids=subscriber_ids, emails=emails, db_session=db_session
+        )
+        result = await db_session.execute(
+            delete(Subscription).where(
+                and_(
+                    Subscription.topic_id == topic_id,
+                    Subscription.subscriber_id.in_(matched),
+                )
+            )
+        )
+        await db_session.commit()
+        return {
+            "requested": counts["requested"],
+            "removed": result.rowcount,
+            "not_subscribed": max(counts["matched"] - result.rowcount, 0),
+            "missing": counts["missing"],
+        }
+
 
 subscription = CRUDSubscription(Subscription)
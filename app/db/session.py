@@ -5,6 +5,7 @@ from sqlalchemy.pool import NullPool, QueuePool
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.metrics import register_pool
 
 DB_POOL_SIZE = 83
 WEB_CONCURRENCY = 9
@@ -17,10 +18,11 @@ engine = create_async_engine(
     str(settings.ASYNC_DATABASE_URI),
     echo=False,
     future=True,
-    pool_size=40,
-    max_overflow=20,
+    pool_size=settings.WORKER_DB_POOL_SIZE,
+    max_overflow=settings.WORKER_DB_MAX_OVERFLOW,
     poolclass=(QueuePool),
 )
+register_pool("worker", engine)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
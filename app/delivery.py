@@ -0,0 +1,407 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import (Any, AsyncIterable, AsyncIterator, Awaitable, Callable,
+                    Dict, Iterable, List, Optional, Set, TypeVar, Union)
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.email import EmailTransport, get_email_transport
+from app.email_templates import template_cache
+from app.metrics import active_fanouts_gauge, deliveries_total, stage_seconds
+from app.retry import next_retry_delay
+
+R = TypeVar("R")
+
+# Stats of fan-outs currently running in this process, keyed by engine name.
+active_fanouts: Dict[str, "FanOutStats"] = {}
+
+# Delivery log buffers that still may hold unflushed rows.
+active_log_buffers: Set["DeliveryLogBuffer"] = set()
+
+active_fanouts_gauge.set_function(lambda: len(active_fanouts))
+
+# Histogram children are resolved once so the hot path skips label lookups.
+_render_seconds = stage_seconds.labels("delivery", "render")
+_provider_seconds = stage_seconds.labels("delivery", "provider_send")
+_log_flush_seconds = stage_seconds.labels("delivery", "log_flush")
+
+
+async def chunked(
+    items: Union[Iterable[R], AsyncIterable[R]], size: int
+) -> AsyncIterator[List[R]]:
+    """
+    Group a sync or async iterable into lists of at most `size` items.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    chunk: List[R] = []
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class FanOutStats:
+    """
+    Live counters for a single fan-out run.
+    `in_flight` is the number of deliveries currently awaiting the transport.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 0.0)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed deliveries per second since the fan-out started.
+        """
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return self.completed / elapsed
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "total": self.total,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "throughput_per_second": round(self.throughput, 2),
+        }
+
+
+class FanOutEngine:
+    """
+    Sends to many recipients with at most `concurrency` deliveries in flight.
+
+    A fixed pool of workers pulls recipients from a bounded queue, so the
+    recipient source may be a plain list or an async iterator that is paged
+    lazily from the database. `deliver` is awaited once per recipient and
+    must return True on success and False on failure; it owns its own retry
+    and logging. Exceptions raised by `deliver` are counted as failures.
+    When items are batches, `weight` gives the number of recipients per item
+    so the counters stay in recipients rather than items.
+    """
+
+    def __init__(self, concurrency: int | None = None, name: str | None = None):
+        concurrency = concurrency or settings.DELIVERY_CONCURRENCY
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.name = name or f"fanout_{id(self)}"
+        self.stats = FanOutStats(concurrency)
+
+    async def run(
+        self,
+        recipients: Union[Iterable[R], AsyncIterable[R]],
+        deliver: Callable[[R], Awaitable[bool]],
+        weight: Callable[[R], int] | None = None,
+    ) -> FanOutStats:
+        stats = self.stats
+        stats.started_at = time.monotonic()
+        active_fanouts[self.name] = stats
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        done = object()
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+                count = weight(item) if weight else 1
+                stats.in_flight += count
+                stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+                try:
+                    ok = await deliver(item)
+                except Exception as exc:
+                    print(f"[delivery] unexpected error for {item!r}: {exc}")
+                    ok = False
+                finally:
+                    stats.in_flight -= count
+                if ok:
+                    stats.succeeded += count
+                else:
+                    stats.failed += count
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            if hasattr(recipients, "__aiter__"):
+                async for item in recipients:
+                    stats.total += weight(item) if weight else 1
+                    await queue.put(item)
+            else:
+                for item in recipients:
+                    stats.total += weight(item) if weight else 1
+                    await queue.put(item)
+            for _ in workers:
+                await queue.put(done)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+            stats.finished_at = time.monotonic()
+            active_fanouts.pop(self.name, None)
+
+        print(f"[delivery] {self.name} finished: {stats.as_dict()}")
+        return stats
+
+
+class DeliveryLogBuffer:
+    """
+    Write-behind buffer for DeliveryLog rows produced by a fan-out.
+
+    Outcomes are collected in memory and written with one multi-row INSERT
+    when `max_size` rows are pending or every `flush_interval` seconds,
+    whichever comes first. Use it as an async context manager: leaving the
+    block flushes whatever is left, and flush_all_log_buffers() drains open
+    buffers on shutdown.
+    """
+
+    def __init__(
+        self,
+        db_session: AsyncSession,
+        max_size: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        self.db_session = db_session
+        self.max_size = max_size or settings.DELIVERY_LOG_BUFFER_SIZE
+        self.flush_interval = flush_interval or settings.DELIVERY_LOG_FLUSH_INTERVAL
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+
+    async def __aenter__(self) -> "DeliveryLogBuffer":
+        active_log_buffers.add(self)
+        self._timer = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def add(
+        self,
+        *,
+        content_id: Any,
+        subscriber_id: Any,
+        status: str,
+        error: Optional[str] = None,
+        attempts: int = 1,
+        next_attempt_at: Optional[datetime] = None,
+    ) -> None:
+        self._rows.append(
+            {
+                "content_id": content_id,
+                "subscriber_id": subscriber_id,
+                "status": status,
+                "error": error,
+                "attempts": attempts,
+                "sent_at": datetime.utcnow(),
+                "next_attempt_at": next_attempt_at,
+            }
+        )
+        if len(self._rows) >= self.max_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._rows:
+                return 0
+            rows, self._rows = self._rows, []
+            try:
+                with _log_flush_seconds.time():
+                    written = await crud.delivery_log.create_logs_bulk(
+                        rows=rows, db_session=self.db_session
+                    )
+            except Exception:
+                # Keep the rows so the next flush (or close) retries them.
+                self._rows = rows + self._rows
+                raise
+            self.flushes += 1
+            self.rows_written += written
+            return written
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as exc:
+                print(f"[delivery] delivery log flush failed: {exc}")
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+        try:
+            await self.flush()
+        finally:
+            active_log_buffers.discard(self)
+
+
+async def flush_all_log_buffers() -> None:
+    for buffer in list(active_log_buffers):
+        try:
+            await buffer.close()
+        except Exception as exc:
+            print(f"[delivery] delivery log flush on shutdown failed: {exc}")
+
+
+class ContentDelivery:
+    """
+    Sends one content item to a stream of recipients: renders the cached
+    template, makes one send attempt and records every outcome in
+    `log_buffer`. Retryable failures are logged as "retrying" with the
+    time they are due again, and any worker's retry poller
+    (app.retry.retry_due_deliveries) sends them later, so the fan-out never
+    waits on them.
+
+    Recipients only need `id`, `email` and `name` attributes, so ORM
+    Subscriber objects and plain result rows both work. Recipients being
+    retried also carry `attempts`, the number of attempts made so far.
+    """
+
+    def __init__(
+        self,
+        content: Any,
+        log_buffer: DeliveryLogBuffer,
+        transport: EmailTransport | None = None,
+    ):
+        self.content = content
+        self.log_buffer = log_buffer
+        self.transport = transport or get_email_transport()
+        self.compiled = template_cache.get(content)
+
+    async def _log_outcome(
+        self,
+        subs,
+        status: str,
+        error: Optional[str],
+        attempt: int,
+        next_attempt_at: Optional[datetime] = None,
+    ) -> None:
+        deliveries_total.labels(status).inc(len(subs))
+        for sub in subs:
+            await self.log_buffer.add(
+                content_id=self.content.id,
+                subscriber_id=sub.id,
+                status=status,
+                error=error,
+                attempts=attempt,
+                next_attempt_at=next_attempt_at,
+            )
+
+    async def _send_once(self, subs, send) -> bool:
+        # A batch is retried as a whole, so it shares one attempt count and
+        # one due time and is claimed together again.
+        attempt = 1 + max(getattr(sub, "attempts", 0) for sub in subs)
+        try:
+            with _provider_seconds.time():
+                await send()
+        except Exception as exc:
+            delay = next_retry_delay(exc, attempt)
+            if delay is None:
+                await self._log_outcome(subs, "failed", str(exc), attempt)
+                return False
+            await self._log_outcome(
+                subs,
+                "retrying",
+                str(exc),
+                attempt,
+                next_attempt_at=datetime.utcnow() + timedelta(seconds=delay),
+            )
+            return False
+
+        await self._log_outcome(subs, "sent", None, attempt)
+        return True
+
+    async def deliver(self, sub) -> bool:
+        content = self.content
+        print(f"[delivery] sending to {sub.email}: {content.subject}")
+        with _render_seconds.time():
+            body_html = self.compiled.render(sub.name)
+        return await self._send_once(
+            [sub],
+            lambda: self.transport.send(
+                recipient_email=sub.email,
+                subscriber_name=sub.name,
+                subject=content.subject,
+                body_text=content.body,
+                body_html=body_html,
+            ),
+        )
+
+    async def deliver_batch(self, subs) -> bool:
+        content = self.content
+        print(f"[delivery] sending batch of {len(subs)} recipients: {content.subject}")
+        with _render_seconds.time():
+            body_html = self.compiled.render(settings.EMAIL_BATCH_GREETING_NAME)
+        return await self._send_once(
+            subs,
+            lambda: self.transport.send_batch(
+                recipient_emails=[sub.email for sub in subs],
+                subject=content.subject,
+                body_text=content.body,
+                body_html=body_html,
+            ),
+        )
+
+    async def run(
+        self,
+        recipients: Union[Iterable[Any], AsyncIterable[Any]],
+        engine: FanOutEngine | None = None,
+    ) -> FanOutStats:
+        """
+        Fan out to `recipients`, one by one or in BCC batches when
+        settings.EMAIL_BATCH_MODE is on.
+        """
+        engine = engine or FanOutEngine(name=f"content_{self.content.id}")
+        if settings.EMAIL_BATCH_MODE:
+            return await engine.run(
+                chunked(recipients, settings.EMAIL_BATCH_SIZE),
+                self.deliver_batch,
+                weight=len,
+            )
+        return await engine.run(recipients, self.deliver)
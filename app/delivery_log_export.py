@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Sequence
+from uuid import UUID
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.delivery_log_schema import DeliveryLogExportFormat
+
+COLUMNS = (
+    "id",
+    "content_id",
+    "subscriber_id",
+    "email",
+    "status",
+    "attempts",
+    "error",
+    "sent_at",
+    "created_at",
+    "updated_at",
+)
+
+MEDIA_TYPES = {
+    DeliveryLogExportFormat.CSV: "text/csv",
+    DeliveryLogExportFormat.NDJSON: "application/x-ndjson",
+}
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(rows: Sequence[Sequence[Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(COLUMNS)
+    writer.writerows([[_cell(v) for v in row] for row in rows])
+    return buffer.getvalue().encode()
+
+
+def encode_ndjson(rows: Sequence[Sequence[Any]]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(COLUMNS, map(_cell, row)))) + "\n" for row in rows
+    ).encode()
+
+
+async def export_delivery_logs(
+    fmt: DeliveryLogExportFormat,
+    content_id: UUID | None = None,
+    statuses: Sequence[str] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export body, one chunk per cursor batch. Runs on its own session
+    because a streamed response outlives the request-scoped one. The first
+    chunk (the CSV header with the first batch) is yielded once the cursor
+    has returned its first rows, so a failing query surfaces there.
+    """
+    encode = encode_csv if fmt == DeliveryLogExportFormat.CSV else encode_ndjson
+    async with SessionLocal() as session:
+        batches = crud.delivery_log.stream_for_export(
+            content_id=content_id,
+            statuses=statuses,
+            since=since,
+            until=until,
+            batch_size=batch_size or settings.DELIVERY_LOG_EXPORT_BATCH_SIZE,
+            db_session=session,
+        )
+        first = await anext(batches, [])
+        if fmt == DeliveryLogExportFormat.CSV:
+            yield encode_csv(first, header=True)
+        else:
+            yield encode_ndjson(first)
+        async for rows in batches:
+            yield encode(rows)
+
+
+async def open_export(*args: Any, **kwargs: Any) -> AsyncIterator[bytes]:
+    """
+    Start export_delivery_logs() and wait for its first chunk, so errors
+    (a bad filter, an unreachable database) are raised before a response
+    is committed to a 200 status. Returns an iterator over the whole body.
+    """
+    chunks = export_delivery_logs(*args, **kwargs)
+    first = await anext(chunks)
+
+    async def body() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return body()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel of content ids.
+
+    Time is cut into ticks of `tick_seconds`; an entry due at tick T lives in
+    slot T % slots together with T itself, so entries more than one
+    revolution away simply wait in their slot until their tick comes round.
+    Insert, cancel and lookup are O(1); firing a tick costs only the size of
+    its slot. Each entry is one small dict item, not a job object.
+    """
+
+    def __init__(self, tick_seconds: float | None = None, slots: int | None = None):
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_WHEEL_TICK_SECONDS
+        self.slots = slots or settings.SCHEDULER_WHEEL_SLOTS
+        self._buckets: List[Dict[str, int]] = [{} for _ in range(self.slots)]
+        self._index: Dict[str, int] = {}
+        self._last_tick: Optional[int] = None
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def insert(self, key: str, due: datetime) -> None:
+        self.cancel(key)
+        tick = self._tick_of(due.timestamp())
+        if self._last_tick is not None and tick <= self._last_tick:
+            # Already past: fire on the next advance.
+            tick = self._last_tick + 1
+        self._buckets[tick % self.slots][key] = tick
+        self._index[key] = tick
+
+    def cancel(self, key: str) -> bool:
+        tick = self._index.pop(key, None)
+        if tick is None:
+            return False
+        self._buckets[tick % self.slots].pop(key, None)
+        return True
+
+    def is_scheduled_at(self, key: str, due: datetime) -> bool:
+        return self._index.get(key) == self._tick_of(due.timestamp())
+
+    def due_at(self, key: str) -> Optional[datetime]:
+        tick = self._index.get(key)
+        if tick is None:
+            return None
+        return datetime.fromtimestamp(tick * self.tick_seconds, tz=timezone.utc)
+
+    def items(self) -> Iterator[Tuple[str, datetime]]:
+        for key in list(self._index):
+            yield key, self.due_at(key)
+
+    def advance(self, now: float | None = None) -> List[str]:
+        """
+        Move the wheel to `now` (epoch seconds) and return every key that
+        became due, removing them from the wheel.
+        """
+        now_tick = self._tick_of(time.time() if now is None else now)
+        if self._last_tick is None:
+            # Nothing has fired yet: sweep every slot once.
+            self._last_tick = now_tick - self.slots
+        if now_tick <= self._last_tick:
+            return []
+
+        first = max(self._last_tick + 1, now_tick - self.slots + 1)
+        due: List[str] = []
+        for tick in range(first, now_tick + 1):
+            bucket = self._buckets[tick % self.slots]
+            if not bucket:
+                continue
+            fired = [key for key, key_tick in bucket.items() if key_tick <= now_tick]
+            for key in fired:
+                del bucket[key]
+                del self._index[key]
+            due.extend(fired)
+        self._last_tick = now_tick
+        return due
+
+    def clear(self) -> None:
+        for bucket in self._buckets:
+            bucket.clear()
+        self._index.clear()
+        self._last_tick = None
+
+
+class WheelDispatcher:
+    """
+    Drives a TimingWheel from the event loop. Every tick the keys that came
+    due are handed to `on_due` as one list, so the caller can confirm and
+    load them with a single query.
+    """
+
+    def __init__(
+        self,
+        on_due: Callable[[List[str]], Awaitable[Any]],
+        wheel: TimingWheel | None = None,
+    ):
+        self.on_due = on_due
+        self.wheel = wheel or TimingWheel()
+        self.fired = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.wheel.clear()
+
+    async def _run(self) -> None:
+        while True:
+            due = self.wheel.advance()
+            if due:
+                self.fired += len(due)
+                try:
+                    await self.on_due(due)
+                except Exception as exc:
+                    print(f"[dispatcher] dispatch of {len(due)} contents failed: {exc}")
+            await asyncio.sleep(self.wheel.tick_seconds)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "scheduled": len(self.wheel),
+            "fired": self.fired,
+            "tick_seconds": self.wheel.tick_seconds,
+            "slots": self.wheel.slots,
+        }
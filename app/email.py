@@ -1,32 +1,147 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
+import aiohttp
+import requests
 from azure.communication.email import EmailClient
+from azure.communication.email.aio import EmailClient as AsyncEmailClient
+from azure.core.exceptions import (HttpResponseError, ServiceRequestError,
+                                   ServiceResponseError)
+from azure.core.pipeline.transport import AioHttpTransport, RequestsTransport
 
 from app.core.config import settings
+from app.rate_limit import AdaptiveConcurrencyLimiter, TokenBucket
 from app.utils.exceptions.common_exceptions import ProcessError
 
+SENDER_EMAIL = "DoNotReply@loong.co.in"
 
-def send_newsletter_email(
-    recipient_email: str,
-    subscriber_name: str,
-    subject: str,
-    body_text: str,
-    body_html: str | None = None,
-):
+
+class EmailClientPool:
     """
-    Sends a newsletter email to a subscriber using Azure Communication Services.
-    Raises ProcessError if sending fails.
+    Process-wide cache of long-lived ACS clients keyed by connection string.
+
+    Clients share keep-alive HTTP sessions, so credentials are parsed once and
+    TCP/TLS connections are reused across a whole fan-out. Each session is
+    capped at `max_connections` concurrent connections.
     """
 
-    try:
-        connection_string = settings.EMAIL_CONNECTION_STRING
-        client = EmailClient.from_connection_string(connection_string)
+    def __init__(self, max_connections: int | None = None):
+        self.max_connections = max_connections or settings.EMAIL_MAX_CONNECTIONS
+        self._lock = threading.Lock()
+        self._sync_clients: Dict[str, EmailClient] = {}
+        self._sync_sessions: Dict[str, requests.Session] = {}
+        self._async_clients: Dict[str, AsyncEmailClient] = {}
+        self._async_sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.hits = 0
+        self.misses = 0
+        self.async_connections_created = 0
+        self.async_connections_reused = 0
 
-        sender_email = "DoNotReply@loong.co.in"
+    def get_sync_client(self, connection_string: str) -> EmailClient:
+        with self._lock:
+            client = self._sync_clients.get(connection_string)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
 
-        # If no HTML provided, build a default newsletter-themed HTML layout
-        if body_html is None:
-            body_html = f"""
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=self.max_connections,
+                pool_block=True,
+            )
+            session.mount("https://", adapter)
+            client = EmailClient.from_connection_string(
+                connection_string,
+                transport=RequestsTransport(session=session, session_owner=False),
+            )
+            self._sync_sessions[connection_string] = session
+            self._sync_clients[connection_string] = client
+            return client
+
+    def get_async_client(self, connection_string: str) -> AsyncEmailClient:
+        # Only called from the event loop thread, so no locking is needed.
+        client = self._async_clients.get(connection_string)
+        if client is not None:
+            self.hits += 1
+            return client
+        self.misses += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+            trace_configs=[trace_config],
+        )
+        client = AsyncEmailClient.from_connection_string(
+            connection_string,
+            transport=AioHttpTransport(session=session, session_owner=False),
+        )
+        self._async_sessions[connection_string] = session
+        self._async_clients[connection_string] = client
+        return client
+
+    async def _on_connection_created(self, session, context, params) -> None:
+        self.async_connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params) -> None:
+        self.async_connections_reused += 1
+
+    def _sync_connection_counts(self) -> Dict[str, int]:
+        created = 0
+        requests_served = 0
+        for session in self._sync_sessions.values():
+            for adapter in session.adapters.values():
+                for key in list(adapter.poolmanager.pools.keys()):
+                    conn_pool = adapter.poolmanager.pools[key]
+                    created += conn_pool.num_connections
+                    requests_served += conn_pool.num_requests
+        return {"created": created, "requests": requests_served}
+
+    def stats(self) -> Dict[str, Any]:
+        sync_counts = self._sync_connection_counts()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_connections": self.max_connections,
+            "sync_clients": len(self._sync_clients),
+            "sync_connections_created": sync_counts["created"],
+            "sync_requests": sync_counts["requests"],
+            "async_clients": len(self._async_clients),
+            "async_connections_created": self.async_connections_created,
+            "async_connections_reused": self.async_connections_reused,
+        }
+
+    async def close(self) -> None:
+        for client in self._async_clients.values():
+            await client.close()
+        for session in self._async_sessions.values():
+            await session.close()
+        with self._lock:
+            # The sync EmailClient has no close(); its transport does not own
+            # the session, so closing the session releases the connections.
+            for session in self._sync_sessions.values():
+                session.close()
+            self._sync_clients.clear()
+            self._sync_sessions.clear()
+        self._async_clients.clear()
+        self._async_sessions.clear()
+
+
+client_pool = EmailClientPool()
+
+
+def build_newsletter_html(subject: str, subscriber_name: str, body_text: str) -> str:
+    """
+    Default newsletter-themed HTML layout used when no HTML body is provided.
+    """
+    return f"""
 <html>
 <head>
     <style>
@@ -82,24 +197,49 @@ def send_newsletter_email(
 </html>
 """
 
-        message = {
-            "senderAddress": sender_email,
-            "recipients": {"to": [{"address": recipient_email}]},
-            "content": {
-                "subject": subject,
-                "plainText": body_text,
-                "html": body_html,
-            },
-        }
 
-        # Send the email and wait for completion
-        poller = client.begin_send(message)
-        result = poller.result()
+def build_message(
+    recipient_email: str,
+    subject: str,
+    body_text: str,
+    body_html: str,
+) -> Dict[str, Any]:
+    return {
+        "senderAddress": SENDER_EMAIL,
+        "recipients": {"to": [{"address": recipient_email}]},
+        "content": {
+            "subject": subject,
+            "plainText": body_text,
+            "html": body_html,
+        },
+    }
 
-    except Exception as error:
-        raise ProcessError(f"Failed to send newsletter to {recipient_email}: {error}")
 
-    # Azure result validation
+def build_batch_message(
+    recipient_emails: List[str],
+    subject: str,
+    body_text: str,
+    body_html: str,
+) -> Dict[str, Any]:
+    """
+    One message addressed to many recipients via BCC, so no recipient sees
+    the others' addresses.
+    """
+    return {
+        "senderAddress": SENDER_EMAIL,
+        "recipients": {"bcc": [{"address": email} for email in recipient_emails]},
+        "content": {
+            "subject": subject,
+            "plainText": body_text,
+            "html": body_html,
+        },
+    }
+
+
+def check_send_result(recipient_email: str, result: Any) -> None:
+    """
+    Validate the Azure poller result. Raises ProcessError if the send failed.
+    """
     status = result.get("status")
 
     if status is None:
@@ -108,3 +248,334 @@ def send_newsletter_email(
 
     if str(status).lower() != "succeeded":
         raise ProcessError(f"Newsletter send failed for {recipient_email}: {result}")
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Map a send failure to a RETRY_POLICIES key by looking through the
+    exception chain for the underlying Azure or network error.
+    """
+    seen = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, HttpResponseError):
+            status = current.status_code or 0
+            if status == 429:
+                return "throttled"
+            if 400 <= status < 500 and status != 408:
+                return "permanent"
+            return "transient"
+        if isinstance(
+            current,
+            (ServiceRequestError, ServiceResponseError, asyncio.TimeoutError, OSError),
+        ):
+            return "transient"
+        current = current.__cause__ or current.__context__
+    return "transient"
+
+
+def send_newsletter_email(
+    recipient_email: str,
+    subscriber_name: str,
+    subject: str,
+    body_text: str,
+    body_html: str | None = None,
+):
+    """
+    Sends a newsletter email to a subscriber using Azure Communication Services.
+    Raises ProcessError if sending fails.
+
+    This call blocks until ACS finishes the send; from async code use an
+    EmailTransport instead (see get_email_transport).
+    """
+
+    try:
+        connection_string = settings.EMAIL_CONNECTION_STRING
+        client = client_pool.get_sync_client(connection_string)
+
+        # If no HTML provided, build a default newsletter-themed HTML layout
+        if body_html is None:
+            body_html = build_newsletter_html(subject, subscriber_name, body_text)
+
+        message = build_message(recipient_email, subject, body_text, body_html)
+
+        # Send the email and wait for completion
+        poller = client.begin_send(message)
+        result = poller.result()
+
+    except Exception as error:
+        raise ProcessError(f"Failed to send newsletter to {recipient_email}: {error}")
+
+    # Azure result validation
+    check_send_result(recipient_email, result)
+
+
+def send_newsletter_batch(
+    recipient_emails: List[str],
+    subject: str,
+    body_text: str,
+    body_html: str,
+):
+    """
+    Sends one newsletter message to many recipients (BCC) and blocks until
+    ACS finishes the send. Raises ProcessError if sending fails.
+    """
+    label = f"batch of {len(recipient_emails)} recipients"
+    try:
+        client = client_pool.get_sync_client(settings.EMAIL_CONNECTION_STRING)
+        message = build_batch_message(recipient_emails, subject, body_text, body_html)
+        poller = client.begin_send(message)
+        result = poller.result()
+
+    except Exception as error:
+        raise ProcessError(f"Failed to send newsletter to {label}: {error}")
+
+    check_send_result(label, result)
+
+
+class EmailTransport:
+    """
+    Async interface used by the scheduler to deliver newsletters without
+    blocking the event loop.
+    """
+
+    async def send(
+        self,
+        *,
+        recipient_email: str,
+        subscriber_name: str,
+        subject: str,
+        body_text: str,
+        body_html: str | None = None,
+    ) -> None:
+        raise NotImplementedError
+
+    async def send_batch(
+        self,
+        *,
+        recipient_emails: List[str],
+        subject: str,
+        body_text: str,
+        body_html: str,
+    ) -> None:
+        """
+        Send one non-personalized message to all `recipient_emails`.
+        The whole batch succeeds or fails together.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+
+class AcsAsyncTransport(EmailTransport):
+    """
+    Sends through the native async ACS client (azure.communication.email.aio).
+    """
+
+    def __init__(self, connection_string: str | None = None):
+        self.connection_string = connection_string or settings.EMAIL_CONNECTION_STRING
+
+    async def send(
+        self,
+        *,
+        recipient_email: str,
+        subscriber_name: str,
+        subject: str,
+        body_text: str,
+        body_html: str | None = None,
+    ) -> None:
+        try:
+            if body_html is None:
+                body_html = build_newsletter_html(subject, subscriber_name, body_text)
+            message = build_message(recipient_email, subject, body_text, body_html)
+
+            client = client_pool.get_async_client(self.connection_string)
+            poller = await client.begin_send(message)
+            result = await poller.result()
+
+        except Exception as error:
+            raise ProcessError(
+                f"Failed to send newsletter to {recipient_email}: {error}"
+            )
+
+        check_send_result(recipient_email, result)
+
+    async def send_batch(
+        self,
+        *,
+        recipient_emails: List[str],
+        subject: str,
+        body_text: str,
+        body_html: str,
+    ) -> None:
+        label = f"batch of {len(recipient_emails)} recipients"
+        try:
+            message = build_batch_message(
+                recipient_emails, subject, body_text, body_html
+            )
+            client = client_pool.get_async_client(self.connection_string)
+            poller = await client.begin_send(message)
+            result = await poller.result()
+
+        except Exception as error:
+            raise ProcessError(f"Failed to send newsletter to {label}: {error}")
+
+        check_send_result(label, result)
+
+
+class ThreadPoolTransport(EmailTransport):
+    """
+    Runs the synchronous ACS client in a bounded thread pool so that at most
+    `max_workers` sends block a thread at a time, and none block the loop.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or settings.EMAIL_THREAD_POOL_SIZE
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="email-send"
+        )
+
+    async def send(
+        self,
+        *,
+        recipient_email: str,
+        subscriber_name: str,
+        subject: str,
+        body_text: str,
+        body_html: str | None = None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor,
+            lambda: send_newsletter_email(
+                recipient_email=recipient_email,
+                subscriber_name=subscriber_name,
+                subject=subject,
+                body_text=body_text,
+                body_html=body_html,
+            ),
+        )
+
+    async def send_batch(
+        self,
+        *,
+        recipient_emails: List[str],
+        subject: str,
+        body_text: str,
+        body_html: str,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor,
+            lambda: send_newsletter_batch(
+                recipient_emails=recipient_emails,
+                subject=subject,
+                body_text=body_text,
+                body_html=body_html,
+            ),
+        )
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+class RateLimitedTransport(EmailTransport):
+    """
+    Wraps another transport with a token bucket (the provider's request
+    quota) and an AIMD concurrency limit that backs off on throttling or
+    rising latency and probes back up while sends succeed.
+
+    With no bucket given and EMAIL_RATE_LIMIT_PER_SECOND <= 0 (the default)
+    sends pass straight through to the inner transport.
+    """
+
+    def __init__(
+        self,
+        inner: EmailTransport,
+        bucket: TokenBucket | None = None,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+    ):
+        self.inner = inner
+        self.bucket = bucket
+        self.limiter = limiter
+        if self.bucket is None and settings.EMAIL_RATE_LIMIT_PER_SECOND > 0:
+            self.bucket = TokenBucket(
+                rate=settings.EMAIL_RATE_LIMIT_PER_SECOND,
+                capacity=settings.EMAIL_RATE_LIMIT_BURST,
+            )
+        if self.limiter is None and self.bucket is not None:
+            self.limiter = AdaptiveConcurrencyLimiter(
+                initial=settings.EMAIL_ADAPTIVE_INITIAL_CONCURRENCY,
+                minimum=settings.EMAIL_ADAPTIVE_MIN_CONCURRENCY,
+                maximum=settings.EMAIL_ADAPTIVE_MAX_CONCURRENCY,
+                latency_factor=settings.EMAIL_ADAPTIVE_LATENCY_FACTOR,
+            )
+
+    async def _call(self, send) -> None:
+        if self.limiter is None:
+            await send()
+            return
+        await self.limiter.acquire()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            started = time.monotonic()
+            try:
+                await send()
+            except Exception as exc:
+                if classify_error(exc) == "throttled":
+                    self.limiter.on_throttle()
+                raise
+            self.limiter.on_success(time.monotonic() - started)
+        finally:
+            await self.limiter.release()
+
+    async def send(self, **kwargs) -> None:
+        await self._call(lambda: self.inner.send(**kwargs))
+
+    async def send_batch(self, **kwargs) -> None:
+        await self._call(lambda: self.inner.send_batch(**kwargs))
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+    def stats(self) -> Dict[str, Any]:
+        rate = self.bucket.rate if self.bucket is not None else 0.0
+        if self.limiter is None:
+            return {"rate_per_second": rate}
+        return {"rate_per_second": rate, **self.limiter.stats()}
+
+
+_transport: Optional[EmailTransport] = None
+
+
+def get_email_transport() -> EmailTransport:
+    """
+    Return the process-wide transport selected by settings.EMAIL_TRANSPORT
+    ("acs_async" or "thread"), rate limited when
+    EMAIL_RATE_LIMIT_PER_SECOND is set above 0.
+    """
+    global _transport
+    if _transport is None:
+        if settings.EMAIL_TRANSPORT == "thread":
+            transport = ThreadPoolTransport()
+        elif settings.EMAIL_TRANSPORT == "acs_async":
+            transport = AcsAsyncTransport()
+        else:
+            raise ProcessError(
+                f"Unknown EMAIL_TRANSPORT '{settings.EMAIL_TRANSPORT}'"
+            )
+        if settings.EMAIL_RATE_LIMIT_PER_SECOND > 0:
+            transport = RateLimitedTransport(transport)
+        _transport = transport
+    return _transport
+
+
+async def close_email_transport() -> None:
+    global _transport
+    if _transport is not None:
+        await _transport.close()
+        _transport = None
+    await client_pool.close()
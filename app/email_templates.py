@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.email import build_newsletter_html
+
+# Placeholder rendered in place of the subscriber name, then split on.
+_NAME_SLOT = f"\x00subscriber_name_{uuid4().hex}\x00"
+
+
+class CompiledNewsletter:
+    """
+    A newsletter HTML document rendered once, with the per-recipient
+    subscriber name left as a gap between pre-rendered segments.
+    """
+
+    def __init__(self, subject: str, body_text: str):
+        self.subject = subject
+        self.body_text = body_text
+        self.segments: List[str] = build_newsletter_html(
+            subject, _NAME_SLOT, body_text
+        ).split(_NAME_SLOT)
+
+    def render(self, subscriber_name: Optional[str]) -> str:
+        return str(subscriber_name).join(self.segments)
+
+
+class NewsletterTemplateCache:
+    """
+    LRU cache of CompiledNewsletter keyed by (content id, updated_at), so an
+    edited content is recompiled while a running fan-out renders once.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size or settings.EMAIL_TEMPLATE_CACHE_SIZE
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[Tuple[UUID, Optional[datetime]], CompiledNewsletter]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content: Any) -> CompiledNewsletter:
+        key = (content.id, getattr(content, "updated_at", None))
+        with self._lock:
+            compiled = self._items.get(key)
+            if compiled is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = CompiledNewsletter(content.subject, content.body)
+        with self._lock:
+            self._items[key] = compiled
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+template_cache = NewsletterTemplateCache()
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.session import engine
+
+
+class SchedulerLeader:
+    """
+    Elects one scheduling process per cluster with a Postgres session-level
+    advisory lock.
+
+    Every process keeps trying `pg_try_advisory_lock(lock_key)` on a
+    dedicated connection. The holder is the leader and runs `on_elected`;
+    the others stay on standby. If the leader's connection dies, Postgres
+    releases the lock, the leader runs `on_demoted`, and a standby takes
+    over on its next attempt.
+    """
+
+    def __init__(
+        self,
+        on_elected: Callable[[], Any],
+        on_demoted: Callable[[], Any],
+        lock_key: int | None = None,
+        retry_seconds: float | None = None,
+    ):
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_key = lock_key or settings.SCHEDULER_LOCK_KEY
+        self.retry_seconds = retry_seconds or settings.SCHEDULER_LEADER_RETRY_SECONDS
+        self.role = "stopped"
+        self.last_error: Optional[str] = None
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.role == "leader"
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "role": self.role,
+            "lock_key": self.lock_key,
+            "last_error": self.last_error,
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self.role = "standby"
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            self._demote()
+        await self._release()
+        self.role = "stopped"
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self.is_leader:
+                    await self._check_alive()
+                else:
+                    await self._try_acquire()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.last_error = str(exc)
+                print(f"[leader] advisory lock check failed: {exc}")
+                if self.is_leader:
+                    self._demote()
+                await self._drop_connection()
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _try_acquire(self) -> None:
+        if self._conn is None:
+            self._conn = await engine.connect()
+        result = await self._conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}
+        )
+        acquired = bool(result.scalar())
+        # Session-level advisory locks survive commit; this only avoids
+        # leaving the connection idle in transaction.
+        await self._conn.commit()
+        if acquired:
+            self.role = "leader"
+            print("[leader] acquired scheduler leadership")
+            self.on_elected()
+
+    async def _check_alive(self) -> None:
+        await self._conn.execute(text("SELECT 1"))
+        await self._conn.commit()
+
+    def _demote(self) -> None:
+        self.role = "standby"
+        print("[leader] lost scheduler leadership")
+        self.on_demoted()
+
+    async def _release(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key}
+            )
+            await self._conn.commit()
+        except Exception as exc:
+            print(f"[leader] advisory unlock failed: {exc}")
+        await self._drop_connection()
+
+    async def _drop_connection(self) -> None:
+        # The connection is invalidated rather than returned to the pool, so
+        # a still-held lock can never leak into another checkout.
+        if self._conn is not None:
+            try:
+                await self._conn.invalidate()
+                await self._conn.close()
+            except Exception:
+                # Closing a broken connection can fail; the lock is gone anyway.
+                pass
+            self._conn = None
@@ -7,12 +7,15 @@ absolute_path = os.path.join(os.path.dirname(__file__), "api")
 sys.path.append(absolute_path)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from fastapi_async_sqlalchemy import SQLAlchemyMiddleware
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.pool import NullPool, QueuePool
 from starlette.middleware.sessions import SessionMiddleware
 
 from app.api.router import api_router as api_router_v1
 from app.core.config import settings
+from app.metrics import CONTENT_TYPE, MetricsMiddleware, register_pool, render
 from app.utils.exceptions.common_exceptions import CustomException
 
 # Core Application Instance
@@ -23,17 +26,18 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
 )
-app.add_middleware(
-    SQLAlchemyMiddleware,
-    db_url=str(settings.ASYNC_DATABASE_URI),
-    engine_args={
-        "echo": False,
-        "pool_pre_ping": True,
-        "pool_size": 100,
-        "max_overflow": 100,
-        "poolclass": (QueuePool),
-    },
+# Created here rather than inside the middleware so its pool can be exported
+# as metrics.
+api_engine = create_async_engine(
+    str(settings.ASYNC_DATABASE_URI),
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=settings.API_DB_POOL_SIZE,
+    max_overflow=settings.API_DB_MAX_OVERFLOW,
+    poolclass=QueuePool,
 )
+register_pool("api", api_engine)
+app.add_middleware(SQLAlchemyMiddleware, custom_engine=api_engine)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -42,6 +46,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.exception_handler(CustomException)
@@ -61,11 +66,39 @@ async def root():
     return {"message": "Hello World"}
 
 
+@app.get("/scheduler/status")
+async def get_scheduler_status():
+    """
+    Whether this process is the scheduling leader or on standby.
+    """
+    from app.scheduler import scheduler_status
+
+    return {"data": scheduler_status()}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus text exposition of this process's metrics (or of all API
+    processes with PROMETHEUS_MULTIPROC_DIR set).
+    """
+    return Response(content=render(), headers={"Content-Type": CONTENT_TYPE})
+
+
 @app.on_event("startup")
 async def on_startup():
-    from app.scheduler import start_scheduler
+    from app.worker import start_background_work
+
+    if settings.RUN_SCHEDULER:
+        start_background_work()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    from app.worker import stop_background_work
 
-    start_scheduler()
+    if settings.RUN_SCHEDULER:
+        await stop_background_work()
 
 
 # Add Routers
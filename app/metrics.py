@@ -0,0 +1,137 @@
+# app/metrics.py
+"""
+Prometheus metrics for the API and the delivery worker, built on
+prometheus_client.
+
+Histograms and counters are updated from the event loop; gauges are
+callbacks evaluated only when /metrics is scraped. Under a multi-process
+server set PROMETHEUS_MULTIPROC_DIR and render() aggregates the histograms
+and counters of every process; callback gauges are not aggregated.
+"""
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess,
+                               start_http_server)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+registry: CollectorRegistry = REGISTRY
+
+stage_seconds = Histogram(
+    "newsletter_stage_seconds",
+    "Time spent per scheduling and delivery stage.",
+    ["component", "stage"],
+    buckets=DEFAULT_BUCKETS,
+)
+deliveries_total = Counter(
+    "newsletter_deliveries",
+    "Delivery outcomes recorded by fan-outs.",
+    ["status"],
+)
+http_request_seconds = Histogram(
+    "newsletter_http_request_seconds",
+    "API request latency per route.",
+    ["method", "route", "status"],
+    buckets=DEFAULT_BUCKETS,
+)
+db_pool_connections = Gauge(
+    "newsletter_db_pool_connections",
+    "Connections per SQLAlchemy pool and state.",
+    ["pool", "state"],
+)
+active_fanouts_gauge = Gauge(
+    "newsletter_active_fanouts", "Content fan-outs currently running."
+)
+
+
+def register_pool(name: str, engine) -> None:
+    """
+    Export size, checked-out, checked-in and overflow gauges for the
+    QueuePool behind `engine` (sync or async).
+    """
+    pool = getattr(engine, "sync_engine", engine).pool
+    db_pool_connections.labels(name, "size").set_function(pool.size)
+    db_pool_connections.labels(name, "checked_out").set_function(pool.checkedout)
+    db_pool_connections.labels(name, "checked_in").set_function(pool.checkedin)
+    db_pool_connections.labels(name, "overflow").set_function(pool.overflow)
+
+
+def render() -> bytes:
+    """
+    Exposition text of this process, or of all processes sharing
+    PROMETHEUS_MULTIPROC_DIR.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        collector_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collector_registry)
+        return generate_latest(collector_registry)
+    return generate_latest(registry)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request, labelled by the matched route
+    template (not the raw path) so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_seconds.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+            ).observe(time.perf_counter() - started)
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0"):
+    """
+    Serve /metrics from a background thread, for processes without the API
+    (the delivery worker). Returns the server; call shutdown() to stop it.
+    """
+    server, _ = start_http_server(port, addr=host, registry=registry)
+    print(f"[metrics] serving /metrics on {host}:{port}")
+    return server
@@ -4,8 +4,8 @@ from uuid import UUID
 
 from pydantic import EmailStr
 from sqlalchemy_utils import ChoiceType
-from sqlmodel import (BigInteger, Column, DateTime, Field, Float, Relationship,
-                      SQLModel, String)
+from sqlmodel import (BigInteger, Column, DateTime, Field, Float, Index,
+                      Relationship, SQLModel, String, text)
 
 from app.models.base_uuid_model import BaseUUIDModel
 
@@ -19,8 +19,18 @@ class ContentBase(SQLModel):
 
 
 class Content(BaseUUIDModel, ContentBase, table=True):
+    __table_args__ = (
+        Index(
+            "ix_Content_pending_scheduled_time",
+            "scheduled_time",
+            postgresql_where=text("status IN ('scheduled', 'sending')"),
+        ),
+    )
+
     topic_id: UUID = Field(foreign_key="Topic.id")
-    sent: bool = False
+    status: str = "scheduled"  # "scheduled", "sending", "sent", "partially_failed"
+    # Set while a process holds the "sending" claim; renewed by its heartbeat.
+    lease_expires_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     topic: Optional["Topic"] = Relationship(back_populates="contents")
@@ -4,19 +4,35 @@ from uuid import UUID
 
 from pydantic import EmailStr
 from sqlalchemy_utils import ChoiceType
-from sqlmodel import (BigInteger, Column, DateTime, Field, Float, Relationship,
-                      SQLModel, String)
+from sqlmodel import (BigInteger, Column, DateTime, Field, Float, Index,
+                      Relationship, SQLModel, String, UniqueConstraint, text)
 
 from app.models.base_uuid_model import BaseUUIDModel
 
 
 class DeliveryLogBase(SQLModel):
-    status: str = "pending"  # "pending", "sent", "failed"
+    status: str = "pending"  # "pending", "sent", "retrying", "failed"
     error: Optional[str] = None
+    attempts: int = 1
     sent_at: Optional[datetime] = None
+    # When a "retrying" delivery is due again; any worker may pick it up.
+    next_attempt_at: Optional[datetime] = None
 
 
 class DeliveryLog(BaseUUIDModel, DeliveryLogBase, table=True):
+    # One row per delivery: retries update it in place, and the fan-out
+    # skips subscribers whose row is already "sent".
+    __table_args__ = (
+        UniqueConstraint(
+            "content_id", "subscriber_id", name="uq_DeliveryLog_content_subscriber"
+        ),
+        Index(
+            "ix_DeliveryLog_retry_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'retrying'"),
+        ),
+    )
+
     content_id: UUID = Field(foreign_key="Content.id")
     subscriber_id: UUID = Field(foreign_key="Subscriber.id")
 
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
+
+from app.models.base_uuid_model import BaseUUIDModel
+
+
+class DeliveryOutboxBase(SQLModel):
+    status: str = "pending"  # "pending", "claimed"
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+
+
+class DeliveryOutbox(BaseUUIDModel, DeliveryOutboxBase, table=True):
+    __table_args__ = (
+        UniqueConstraint(
+            "content_id", "subscriber_id", name="uq_DeliveryOutbox_content_subscriber"
+        ),
+        Index("ix_DeliveryOutbox_status_created_at", "status", "created_at"),
+    )
+
+    content_id: UUID = Field(foreign_key="Content.id", index=True)
+    subscriber_id: UUID = Field(foreign_key="Subscriber.id")
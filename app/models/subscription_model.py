@@ -4,7 +4,8 @@ from uuid import UUID
 
 from pydantic import EmailStr
 from sqlalchemy_utils import ChoiceType
-from sqlmodel import Column, Field, Relationship, SQLModel, String
+from sqlmodel import (Column, Field, Index, Relationship, SQLModel, String,
+                      UniqueConstraint)
 
 from app.models.base_uuid_model import BaseUUIDModel
 
@@ -14,6 +15,14 @@ class SubscriptionBase(SQLModel):
 
 
 class Subscription(BaseUUIDModel, SubscriptionBase, table=True):
+    __table_args__ = (
+        UniqueConstraint(
+            "subscriber_id", "topic_id", name="uq_Subscription_subscriber_topic"
+        ),
+        # Serves the fan-out's keyset walk over a topic's subscribers.
+        Index("ix_Subscription_topic_id_subscriber_id", "topic_id", "subscriber_id"),
+    )
+
     subscriber_id: UUID = Field(foreign_key="Subscriber.id")
     topic_id: UUID = Field(foreign_key="Topic.id")
 
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import socket
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.delivery import ContentDelivery, DeliveryLogBuffer, FanOutEngine
+from app.schemas.content_schema import ContentStatus
+
+# Identifies this process in DeliveryOutbox.claimed_by.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+FINISHED = (ContentStatus.SENT.value, ContentStatus.PARTIALLY_FAILED.value)
+
+
+async def enqueue_content(content: Any) -> int:
+    """
+    Materialize the fan-out for `content` as one outbox row per subscriber.
+    """
+    async with SessionLocal() as session:
+        inserted = await crud.delivery_outbox.enqueue_for_content(
+            content_id=content.id, topic_id=content.topic_id, db_session=session
+        )
+    print(f"[outbox] enqueued {inserted} deliveries for content {content.id}")
+    return inserted
+
+
+async def drain_outbox(content_id: UUID | str | None = None) -> int:
+    """
+    Claim and deliver outbox rows until none are left to claim, optionally
+    restricted to one content. Any number of processes may run this at once;
+    SKIP LOCKED claims keep them from sending the same row twice.
+
+    Whichever worker delivers a content's last rows finishes it as "sent" or
+    "partially_failed".
+    Returns the number of deliveries attempted by this call.
+    """
+    attempted = 0
+    contents: Dict[UUID, Any] = {}
+    async with SessionLocal() as session, SessionLocal() as log_session:
+        async with DeliveryLogBuffer(log_session) as log_buffer:
+            while True:
+                rows = await crud.delivery_outbox.claim_batch(
+                    worker_id=WORKER_ID,
+                    limit=settings.OUTBOX_CLAIM_BATCH_SIZE,
+                    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+                    content_id=content_id,
+                    db_session=session,
+                )
+                if not rows:
+                    break
+
+                by_content: Dict[UUID, List[Any]] = {}
+                for row in rows:
+                    by_content.setdefault(row.content_id, [])
+                    if not row.attempted:
+                        by_content[row.content_id].append(row)
+
+                for cid, recipients in by_content.items():
+                    if not recipients:
+                        # Every claimed row was already attempted.
+                        continue
+                    content = contents.get(cid)
+                    if content is None:
+                        content = await crud.content.get_by_id(
+                            id=cid, db_session=session
+                        )
+                        contents[cid] = content
+                    if content is None or content.status in FINISHED:
+                        continue
+                    await ContentDelivery(content, log_buffer).run(
+                        recipients, FanOutEngine(name=f"outbox_{cid}")
+                    )
+                    attempted += len(recipients)
+
+                # Outcomes must be durable before the outbox rows disappear.
+                await log_buffer.flush()
+                await crud.delivery_outbox.remove_many(
+                    ids=[row.outbox_id for row in rows], db_session=session
+                )
+
+                for cid in by_content:
+                    remaining = await crud.delivery_outbox.count_for_content(
+                        content_id=cid, db_session=session
+                    )
+                    if remaining == 0:
+                        await crud.content.finish_sending(id=cid, db_session=session)
+    return attempted
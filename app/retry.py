@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.email import classify_error
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in
+    [0, min(max_delay, base_delay * 2 ** (n - 1))]. `max_attempts` counts
+    the first send, so max_attempts=1 means never retry.
+    """
+
+    def __init__(self, max_attempts: int, base_delay: float = 0, max_delay: float = 0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def next_delay(self, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before the attempt after `attempt`, or None when the
+        delivery should be given up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    # Provider quota hit: back off harder so the quota can recover.
+    "throttled": RetryPolicy(
+        max_attempts=settings.RETRY_MAX_ATTEMPTS,
+        base_delay=settings.RETRY_THROTTLED_BASE_DELAY_SECONDS,
+        max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+    ),
+    # Timeouts, connection errors and 5xx responses.
+    "transient": RetryPolicy(
+        max_attempts=settings.RETRY_MAX_ATTEMPTS,
+        base_delay=settings.RETRY_BASE_DELAY_SECONDS,
+        max_delay=settings.RETRY_MAX_DELAY_SECONDS,
+    ),
+    # Rejected requests (bad address, invalid payload) will not improve.
+    "permanent": RetryPolicy(max_attempts=1),
+}
+
+
+def next_retry_delay(exc: BaseException, attempt: int) -> Optional[float]:
+    return RETRY_POLICIES[classify_error(exc)].next_delay(attempt)
+
+
+async def retry_due_deliveries() -> int:
+    """
+    Claim and resend due "retrying" deliveries until none are left. Every
+    worker runs this; SKIP LOCKED claims keep them from retrying the same
+    delivery twice. Rows are regrouped per content, so in batch mode the
+    recipients of a failed BCC send are retried as one batch again.
+
+    Contents whose last pending retry reaches a final outcome are closed.
+    Returns the number of deliveries attempted by this call.
+    """
+    from app.delivery import ContentDelivery, DeliveryLogBuffer, FanOutEngine
+
+    attempted = 0
+    async with SessionLocal() as session, SessionLocal() as log_session:
+        async with DeliveryLogBuffer(log_session) as log_buffer:
+            while True:
+                rows = await crud.delivery_log.claim_due_retries(
+                    limit=settings.RETRY_CLAIM_BATCH_SIZE,
+                    lease_seconds=settings.RETRY_LEASE_SECONDS,
+                    db_session=session,
+                )
+                if not rows:
+                    break
+
+                by_content: Dict[UUID, List[Any]] = {}
+                for row in rows:
+                    by_content.setdefault(row.content_id, []).append(row)
+
+                for cid, recipients in by_content.items():
+                    content = await crud.content.get_by_id(id=cid, db_session=session)
+                    if content is None:
+                        continue
+                    print(f"[retry] retrying {len(recipients)} deliveries of {cid}")
+                    await ContentDelivery(content, log_buffer).run(
+                        recipients, FanOutEngine(name=f"retry_{cid}")
+                    )
+                    attempted += len(recipients)
+
+                await log_buffer.flush()
+                settled = await crud.content.settle_retried(
+                    ids=list(by_content), db_session=session
+                )
+                for cid, status in settled:
+                    print(f"[retry] content {cid} finished as {status}")
+    return attempted
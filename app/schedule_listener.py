@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import asyncpg
+
+from app.core.config import settings
+from app.crud.content_crud import SCHEDULE_CHANNEL
+
+
+def _asyncpg_dsn() -> str:
+    # asyncpg does not understand SQLAlchemy's "+asyncpg" driver suffix.
+    return str(settings.ASYNC_DATABASE_URI).replace(
+        "postgresql+asyncpg://", "postgresql://", 1
+    )
+
+
+class ScheduleListener:
+    """
+    LISTENs on SCHEDULE_CHANNEL and applies each content schedule change as
+    soon as it is committed, instead of waiting for the next periodic refresh.
+
+    `on_schedule(content_id, run_time)` and `on_unschedule(content_id)` are
+    called from the event loop. The connection is re-established after a
+    failure; changes missed meanwhile are caught by the periodic refresh.
+    """
+
+    def __init__(
+        self,
+        on_schedule: Callable[[str, datetime], Any],
+        on_unschedule: Callable[[str], Any],
+        reconnect_seconds: float | None = None,
+    ):
+        self.on_schedule = on_schedule
+        self.on_unschedule = on_unschedule
+        self.reconnect_seconds = (
+            reconnect_seconds or settings.SCHEDULE_LISTENER_RECONNECT_SECONDS
+        )
+        self.received = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(_asyncpg_dsn())
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: closed.set())
+                await conn.add_listener(SCHEDULE_CHANNEL, self._on_notification)
+                print(f"[schedule_listener] listening on {SCHEDULE_CHANNEL}")
+                await closed.wait()
+                print("[schedule_listener] connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"[schedule_listener] listener failed: {exc}")
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        self.received += 1
+        try:
+            event = json.loads(payload)
+            content_id = event["content_id"]
+            if event["action"] == "schedule" and event.get("scheduled_time"):
+                self.on_schedule(
+                    content_id, datetime.fromisoformat(event["scheduled_time"])
+                )
+            elif event["action"] == "unschedule":
+                self.on_unschedule(content_id)
+        except Exception as exc:
+            print(f"[schedule_listener] bad notification {payload!r}: {exc}")
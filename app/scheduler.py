@@ -2,82 +2,141 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
 
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.date import DateTrigger
 
 from app import crud
+from app.core.config import settings
 from app.db.session import SessionLocal
-from app.email import send_newsletter_email
+from app.delivery import ContentDelivery, DeliveryLogBuffer
+from app.dispatcher import WheelDispatcher
+from app.email import client_pool, get_email_transport
+from app.leader import SchedulerLeader
+from app.metrics import stage_seconds
+from app.outbox import drain_outbox, enqueue_content
+from app.schedule_listener import ScheduleListener
 
-scheduler = AsyncIOScheduler()
+JOBSTORE_TABLE = "apscheduler_jobs"
+
+
+def _build_scheduler() -> AsyncIOScheduler:
+    """
+    Jobs live in memory by default. With SCHEDULER_JOBSTORE="sqlalchemy"
+    they are persisted in the apscheduler_jobs table, so a restarted leader
+    reattaches them instead of rebuilding every job, at the cost of blocking
+    psycopg2 I/O on the event loop for every job store access. Jobs that
+    missed their run time during downtime fire once (coalesced) if still
+    within the misfire grace period.
+    """
+    jobstores = {}
+    if settings.SCHEDULER_JOBSTORE == "sqlalchemy":
+        sync_url = str(settings.ASYNC_DATABASE_URI).replace(
+            "+asyncpg", "+psycopg2", 1
+        )
+        jobstores["default"] = SQLAlchemyJobStore(
+            url=sync_url, tablename=JOBSTORE_TABLE
+        )
+    return AsyncIOScheduler(
+        jobstores=jobstores,
+        job_defaults={
+            "coalesce": True,
+            "max_instances": 1,
+            "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_SECONDS,
+        },
+        timezone=timezone.utc,
+    )
+
+
+scheduler = _build_scheduler()
 
 
 async def send_content_job(content_id: str | int):
+    _in_progress.add(str(content_id))
+    try:
+        with stage_seconds.labels("scheduler", "send_content_job").time():
+            await _send_content(content_id)
+    finally:
+        _in_progress.discard(str(content_id))
+
+
+async def _renew_claim(content_id):
+    # Keeps the "sending" lease alive so no other process reclaims the
+    # content while this fan-out is still running.
+    while True:
+        await asyncio.sleep(settings.CONTENT_SENDING_LEASE_SECONDS / 3)
+        try:
+            async with SessionLocal() as session:
+                if not await crud.content.renew_claim(
+                    id=content_id, db_session=session
+                ):
+                    print(f"[scheduler] lost sending claim on content {content_id}")
+                    return
+        except Exception as exc:
+            print(f"[scheduler] renewing claim on content {content_id} failed: {exc}")
+
+
+async def _send_content(content_id: str | int):
     async with SessionLocal() as session:
-        content = await crud.content.get_by_id(id=content_id, db_session=session)
+        with stage_seconds.labels("scheduler", "claim").time():
+            content = await crud.content.claim_for_sending(
+                id=content_id, db_session=session
+            )
         print(f"[scheduler] send_content_job - Content: {content}")
         if not content:
+            # Missing, finished, being sent by another process, or not due
+            # yet (a stale job for a content that was moved later).
             return
 
-        if getattr(content, "sent", False):
-            return
-
-        subscribers = await crud.subscription.list_subscribers_for_topic(
-            topic_id=content.topic_id, db_session=session
-        )
-
-        if not subscribers:
-            await crud.content.mark_sent(id=content.id, db_session=session)
-            return
+        heartbeat = asyncio.create_task(_renew_claim(content.id))
+        try:
+            if settings.DELIVERY_USE_OUTBOX:
+                # The worker that drains the last outbox row finishes the content.
+                await enqueue_content(content)
+                await drain_outbox(content_id=content.id)
+                return
 
-        send_any = False
-        for sub in subscribers:
-            attempt = 0
-            last_err = None
-            while attempt <= 1:
-                try:
-                    print(f"[scheduler] sending to {sub.email}: {content.subject}")
-                    send_newsletter_email(
-                        recipient_email=sub.email,
-                        subscriber_name=sub.name,
-                        subject=content.subject,
-                        body_text=content.body,
-                    )
-                    err = None
-                except Exception as exc:
-                    err = str(exc)
-
-                if not err:
-                    await crud.delivery_log.create_log(
-                        content_id=content.id,
-                        subscriber_id=sub.id,
-                        status="sent",
-                        error=None,
-                        db_session=session,
-                    )
-                    send_any = True
-                    break
-                else:
-                    last_err = err
-                    await asyncio.sleep(5)
-                    attempt += 1
-
-            if last_err:
-                await crud.delivery_log.create_log(
-                    content_id=content.id,
-                    subscriber_id=sub.id,
-                    status="failed",
-                    error=last_err,
-                    db_session=session,
+            # The buffer is the only user of `session` while the fan-out runs
+            # and flushes the remaining rows before the content is finished.
+            # Recipients are paged on a separate session so reading the next
+            # page never overlaps with a buffer flush. Subscribers an
+            # interrupted earlier run already attempted (sent, failed or
+            # awaiting a retry) are skipped.
+            async with SessionLocal() as read_session, DeliveryLogBuffer(
+                session
+            ) as log_buffer:
+                subscribers = crud.subscription.iter_subscribers_for_topic(
+                    topic_id=content.topic_id,
+                    chunk_size=settings.DELIVERY_RECIPIENT_CHUNK_SIZE,
+                    undelivered_content_id=content.id,
+                    db_session=read_session,
                 )
+                stats = await ContentDelivery(content, log_buffer).run(subscribers)
+        except Exception:
+            await crud.content.release_claim(id=content.id, db_session=session)
+            raise
+        finally:
+            heartbeat.cancel()
 
-        if send_any:
-            await crud.content.mark_sent(id=content.id, db_session=session)
-        else:
-            pass
+        print(f"[scheduler] email client pool: {client_pool.stats()}")
+        transport = get_email_transport()
+        if hasattr(transport, "stats"):
+            print(f"[scheduler] email rate limiter: {transport.stats()}")
+
+        # Failed deliveries are either retried or failed for good, so the
+        # content is finished (or waits for its retries) even when nothing
+        # got through; releasing it would fan out to the same recipients again.
+        with stage_seconds.labels("scheduler", "finish").time():
+            status = await crud.content.finish_sending(
+                id=content.id, db_session=session
+            )
+        print(
+            f"[scheduler] content {content.id} fan-out done "
+            f"({stats.succeeded}/{stats.total} sent), status {status}"
+        )
 
 
 def schedule_content_job(content_id: str | int, run_time: datetime):
@@ -87,6 +146,10 @@ def schedule_content_job(content_id: str | int, run_time: datetime):
     else:
         run_time = run_time.astimezone(timezone.utc)
 
+    if settings.SCHEDULER_DISPATCHER == "wheel":
+        dispatcher.wheel.insert(str(content_id), run_time)
+        return
+
     job_id = f"content_{content_id}"
     trigger = DateTrigger(run_date=run_time)
 
@@ -99,28 +162,151 @@ def schedule_content_job(content_id: str | int, run_time: datetime):
     )
 
 
+# Incremental refresh state: the end of the last look-ahead window and the
+# time the last refresh started (a high-water mark on Content.updated_at).
+_refresh_state: Dict[str, Optional[datetime]] = {
+    "window_end": None,
+    "changed_since": None,
+}
+
+# Contents whose send_content_job is running right now.
+_in_progress: Set[str] = set()
+
+
 async def load_and_schedule_pending():
 
     print("[scheduler] load_and_schedule_pending running")
+    now = datetime.now(timezone.utc)
+    refresh_started = datetime.utcnow()
+    window_end = now + timedelta(minutes=settings.SCHEDULER_LOOKAHEAD_MINUTES)
+    changed_since = _refresh_state["changed_since"]
     async with SessionLocal() as session:
-        all_pending = await crud.content.get_all(db_session=session)
-        now = datetime.now(timezone.utc)
-        for c in all_pending:
-            if getattr(c, "sent", False):
-                continue
-            run_time = c.scheduled_time
-            if not run_time:
-                continue
-
-            if run_time.tzinfo is None:
-                run_time = run_time.replace(tzinfo=timezone.utc)
-            else:
-                run_time = run_time.astimezone(timezone.utc)
-
-            if run_time <= now:
-                schedule_content_job(c.id, now)
-            else:
-                schedule_content_job(c.id, run_time)
+        with stage_seconds.labels("scheduler", "schedule_candidates").time():
+            candidates = await crud.content.get_schedule_candidates(
+                now=now,
+                window_end=window_end,
+                previous_window_end=_refresh_state["window_end"],
+                changed_since=changed_since,
+                db_session=session,
+            )
+
+    if settings.SCHEDULER_DISPATCHER == "wheel":
+        wheel = dispatcher.wheel
+
+        def is_registered(content_id) -> bool:
+            return str(content_id) in wheel
+
+        def is_registered_at(content_id, run_time: datetime) -> bool:
+            return wheel.is_scheduled_at(str(content_id), run_time)
+
+    else:
+        # One job store read up front instead of one lookup per candidate,
+        # which matters once jobs live in the database. It runs in a thread
+        # so a database job store does not block the event loop.
+        jobs = await asyncio.to_thread(scheduler.get_jobs)
+        existing = {
+            job.id: job.next_run_time
+            for job in jobs
+            if job.id.startswith("content_")
+        }
+
+        def is_registered(content_id) -> bool:
+            return f"content_{content_id}" in existing
+
+        def is_registered_at(content_id, run_time: datetime) -> bool:
+            next_run_time = existing.get(f"content_{content_id}")
+            return (
+                next_run_time is not None
+                and next_run_time.astimezone(timezone.utc) == run_time
+            )
+
+    registered = unscheduled = 0
+    for content_id, run_time in candidates:
+        if not run_time or str(content_id) in _in_progress:
+            continue
+
+        if run_time.tzinfo is None:
+            run_time = run_time.replace(tzinfo=timezone.utc)
+        else:
+            run_time = run_time.astimezone(timezone.utc)
+
+        if run_time > window_end:
+            # Moved past the look-ahead window; a later refresh brings it back.
+            if is_registered(content_id):
+                unschedule_content_job(str(content_id))
+                unscheduled += 1
+        elif run_time <= now:
+            if not is_registered(content_id):
+                schedule_content_job(content_id, now)
+                registered += 1
+        elif not is_registered_at(content_id, run_time):
+            schedule_content_job(content_id, run_time)
+            registered += 1
+
+    _refresh_state["window_end"] = window_end
+    # Step back a little so rows committed just after this refresh started,
+    # but stamped before it, are still seen next time.
+    _refresh_state["changed_since"] = refresh_started - timedelta(
+        seconds=settings.SCHEDULER_REFRESH_OVERLAP_SECONDS
+    )
+    print(
+        f"[scheduler] {len(candidates)} candidates, {registered} jobs registered, "
+        f"{unscheduled} unscheduled"
+    )
+
+
+def apply_schedule_change(content_id: str, run_time: datetime):
+    """
+    Register or move the content's job in response to a content write.
+    """
+    if str(content_id) in _in_progress:
+        return
+    now = datetime.now(timezone.utc)
+    if run_time.tzinfo is None:
+        run_time = run_time.replace(tzinfo=timezone.utc)
+    schedule_content_job(content_id, max(run_time, now))
+
+
+def unschedule_content_job(content_id: str):
+    if settings.SCHEDULER_DISPATCHER == "wheel":
+        dispatcher.wheel.cancel(str(content_id))
+        return
+    job = scheduler.get_job(f"content_{content_id}")
+    if job is not None:
+        job.remove()
+
+
+# Strong references to sends started by the wheel dispatcher.
+_dispatched: Set[asyncio.Task] = set()
+
+
+async def dispatch_due_contents(content_ids: List[str]):
+    """
+    Start a send for every due content that is still unsent, confirmed with
+    one query for the whole tick.
+    """
+    async with SessionLocal() as session:
+        due_ids = await crud.content.get_due_unsent_ids(
+            ids=content_ids,
+            as_of=datetime.now(timezone.utc),
+            db_session=session,
+        )
+    for content_id in due_ids:
+        if str(content_id) in _in_progress:
+            continue
+        task = asyncio.get_running_loop().create_task(
+            send_content_job(str(content_id))
+        )
+        _dispatched.add(task)
+        task.add_done_callback(_dispatched.discard)
+
+
+dispatcher = WheelDispatcher(on_due=dispatch_due_contents)
+
+
+schedule_listener = ScheduleListener(
+    on_schedule=apply_schedule_change, on_unschedule=unschedule_content_job
+)
 
 
 def start_scheduler():
@@ -134,6 +320,9 @@ def start_scheduler():
 
     if loop is not None:
         loop.create_task(load_and_schedule_pending())
+        schedule_listener.start()
+        if settings.SCHEDULER_DISPATCHER == "wheel":
+            dispatcher.start()
     else:
 
         asyncio.run(load_and_schedule_pending())
@@ -145,3 +334,47 @@ def start_scheduler():
         id="refresh_pending_contents",
         replace_existing=True,
     )
+
+    if settings.DELIVERY_USE_OUTBOX:
+        # Picks up rows left behind by crashed workers or other processes.
+        scheduler.add_job(
+            drain_outbox,
+            "interval",
+            seconds=settings.OUTBOX_POLL_SECONDS,
+            id="drain_outbox",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+
+def stop_scheduler():
+    """
+    Stop the scheduler, e.g. when leadership is lost. In-memory jobs are
+    dropped and rebuilt by the next start_scheduler(); persisted jobs stay in
+    the job store for whichever process leads next.
+    """
+    schedule_listener.stop()
+    dispatcher.stop()
+    if scheduler.running:
+        if settings.SCHEDULER_JOBSTORE == "memory":
+            scheduler.remove_all_jobs()
+        scheduler.shutdown(wait=False)
+    _refresh_state["window_end"] = None
+    _refresh_state["changed_since"] = None
+
+
+leader = SchedulerLeader(on_elected=start_scheduler, on_demoted=stop_scheduler)
+
+
+def scheduler_status() -> dict:
+    return {
+        **leader.status(),
+        "leader_election": settings.SCHEDULER_LEADER_ELECTION,
+        "scheduler_running": scheduler.running,
+        "jobstore": settings.SCHEDULER_JOBSTORE,
+        "schedule_listener_running": schedule_listener.running,
+        "schedule_notifications_received": schedule_listener.received,
+        "dispatcher": settings.SCHEDULER_DISPATCHER,
+        "wheel": dispatcher.status(),
+    }
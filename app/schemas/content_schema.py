@@ -34,6 +34,13 @@ def _parse_iso_datetime_to_aware(dt_in) -> datetime:
     raise ValueError("Unsupported datetime input type")
 
 
+class ContentStatus(str, Enum):
+    SCHEDULED = "scheduled"
+    SENDING = "sending"
+    SENT = "sent"
+    PARTIALLY_FAILED = "partially_failed"
+
+
 class ContentCreate(BaseModel):
     topic_id: UUID
     subject: str
@@ -61,7 +68,6 @@ class ContentUpdate(BaseModel):
     subject: Optional[str] = None
     body: Optional[str] = None
     scheduled_time: Optional[datetime] = None
-    sent: Optional[bool] = None
 
     @field_validator("subject")
     def strip_subject_if_present(cls, v: Optional[str]) -> Optional[str]:
@@ -85,5 +91,5 @@ class ContentRead(BaseModel):
     subject: str
     body: str
     scheduled_time: datetime
-    sent: bool
+    status: ContentStatus
     created_at: Optional[datetime]
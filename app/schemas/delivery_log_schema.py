@@ -11,9 +11,15 @@ from pydantic import BaseModel, EmailStr, field_validator
 class DeliveryStatus(str, Enum):
     PENDING = "pending"
     SENT = "sent"
+    RETRYING = "retrying"
     FAILED = "failed"
 
 
+class DeliveryLogExportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class DeliveryLogCreate(BaseModel):
     id: UUID
     content_id: UUID
@@ -24,6 +30,7 @@ class DeliveryLogCreate(BaseModel):
 class DeliveryLogUpdate(DeliveryLogCreate):
     status: DeliveryStatus
     error: Optional[str]
+    attempts: int
     sent_at: Optional[datetime]
 
 
@@ -33,4 +40,5 @@ class DeliveryLogRead(BaseModel):
     subscriber_id: UUID
     status: DeliveryStatus
     error: Optional[str]
+    attempts: int
     sent_at: Optional[datetime]
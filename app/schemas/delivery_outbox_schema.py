@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, EmailStr, field_validator
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    CLAIMED = "claimed"
+
+
+class DeliveryOutboxCreate(BaseModel):
+    content_id: UUID
+    subscriber_id: UUID
+    status: OutboxStatus = OutboxStatus.PENDING
+
+
+class DeliveryOutboxUpdate(BaseModel):
+    status: OutboxStatus
+    claimed_by: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+
+
+class DeliveryOutboxRead(BaseModel):
+    id: UUID
+    content_id: UUID
+    subscriber_id: UUID
+    status: OutboxStatus
+    claimed_by: Optional[str]
+    claimed_at: Optional[datetime]
@@ -2,6 +2,7 @@ from collections.abc import Sequence
 from math import ceil
 from typing import Any, Generic, TypeVar
 
+from fastapi import Query
 from fastapi_pagination import Page, Params
 from fastapi_pagination.bases import AbstractPage, AbstractParams
 from pydantic import BaseModel, Field
@@ -19,6 +20,29 @@ class PageBase(Page[T], Generic[T]):
     )
 
 
+class CursorParams:
+    """
+    Query parameters of keyset-paginated list endpoints: `cursor` is the
+    opaque `next_cursor` of the previous page (omit it for the first page).
+    """
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None, description="Opaque page cursor"),
+        size: int = Query(default=50, ge=1, le=500, description="Page size"),
+    ):
+        self.cursor = cursor
+        self.size = size
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: Sequence[T]
+    size: int
+    next_cursor: str | None = Field(
+        default=None, description="Cursor of the next page, None on the last page"
+    )
+
+
 class ErrorDetail(BaseModel):
     code: int
     message: str
@@ -23,3 +23,34 @@ class SubscriberRead(BaseModel):
     name: Optional[str]
     email: EmailStr
     created_at: Optional[datetime]
+
+
+class SubscriberImportFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+class SubscriberImportRowStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    EXISTING = "existing"
+    DUPLICATE = "duplicate"
+    INVALID = "invalid"
+
+
+class SubscriberImportRow(BaseModel):
+    line: int
+    email: Optional[str] = None
+    status: SubscriberImportRowStatus
+    error: Optional[str] = None
+
+
+class SubscriberImportResult(BaseModel):
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    existing: int = 0
+    duplicate: int = 0
+    invalid: int = 0
+    # Every row that was not created, so the outcome of each line is known.
+    rows: List[SubscriberImportRow] = []
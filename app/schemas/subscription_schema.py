@@ -5,7 +5,7 @@ from enum import Enum
 from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
 
 
 class SubscriptionCreate(BaseModel):
@@ -22,3 +22,31 @@ class SubscriptionRead(BaseModel):
     subscriber_id: UUID
     topic_id: UUID
     created_at: Optional[datetime]
+
+
+class BulkSubscriptionRequest(BaseModel):
+    topic_id: UUID
+    subscriber_ids: List[UUID] = []
+    emails: List[EmailStr] = []
+
+    @model_validator(mode="after")
+    def non_empty_request(self) -> "BulkSubscriptionRequest":
+        if not self.subscriber_ids and not self.emails:
+            raise ValueError("subscriber_ids or emails must not be empty")
+        return self
+
+
+class BulkSubscribeResult(BaseModel):
+    # Distinct ids and emails in the request.
+    requested: int
+    added: int
+    already_present: int
+    # Ids and emails that match no subscriber.
+    missing: int
+
+
+class BulkUnsubscribeResult(BaseModel):
+    requested: int
+    removed: int
+    not_subscribed: int
+    missing: int
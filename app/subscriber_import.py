@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app import crud
+from app.core.config import settings
+from app.schemas.subscriber_schema import (SubscriberCreate,
+                                           SubscriberImportFormat,
+                                           SubscriberImportResult,
+                                           SubscriberImportRow,
+                                           SubscriberImportRowStatus)
+
+# (line number, parsed row or None, parse error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a byte stream into decoded lines without holding more than one
+    incomplete line in memory.
+    """
+    pending = b""
+    first = True
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            line = raw.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+            first = False
+            yield line
+    if pending:
+        yield pending.decode("utf-8-sig" if first else "utf-8").rstrip("\r")
+
+
+async def parse_rows(
+    lines: AsyncIterator[str], fmt: SubscriberImportFormat
+) -> AsyncIterator[ParsedRow]:
+    """
+    Yield one entry per non-blank record, numbered by its first line. CSV
+    input needs a header row with an `email` column and may have a `name`
+    column; a quoted field may span lines (RFC 4180). NDJSON input is one
+    object per line.
+    """
+    header: Optional[List[str]] = None
+    # Lines of a CSV record whose quoted field is still open, and its line.
+    record: List[str] = []
+    record_line = 0
+    quotes = 0
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not record and not line.strip():
+            continue
+        if fmt == SubscriberImportFormat.CSV:
+            if not record:
+                record_line = line_no
+            record.append(line + "\n")
+            # Escaped quotes come in pairs, so an odd count means the
+            # record continues on the next line.
+            quotes += line.count('"')
+            if quotes % 2:
+                continue
+            fields = next(csv.reader(record))
+            record = []
+            quotes = 0
+            if header is None:
+                header = [field.strip().lower() for field in fields]
+                if "email" not in header:
+                    yield record_line, None, "CSV header must contain an 'email' column"
+                    return
+                continue
+            yield record_line, dict(zip(header, fields)), None
+        else:
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_no, None, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(row, dict):
+                yield line_no, None, "Each line must be a JSON object"
+                continue
+            yield line_no, row, None
+    if record:
+        yield record_line, None, "Unterminated quoted field"
+
+
+class SubscriberImport:
+    """
+    Validates parsed rows and writes them in batches of `batch_size` with
+    crud.subscriber.upsert_many, one commit per batch, so memory stays
+    bounded by the batch and the list of rows that were not created.
+    """
+
+    def __init__(
+        self,
+        update_existing: bool = False,
+        batch_size: int | None = None,
+        db_session: AsyncSession | None = None,
+    ):
+        self.update_existing = update_existing
+        self.batch_size = batch_size or settings.SUBSCRIBER_IMPORT_BATCH_SIZE
+        self.db_session = db_session
+        self.result = SubscriberImportResult()
+        # email -> line for the rows of the current batch.
+        self._batch: Dict[str, int] = {}
+        self._rows: List[Dict[str, Any]] = []
+
+    def _record(
+        self,
+        line: int,
+        email: Optional[str],
+        status: SubscriberImportRowStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        self.result.total += 1
+        setattr(self.result, status.value, getattr(self.result, status.value) + 1)
+        if status != SubscriberImportRowStatus.CREATED:
+            self.result.rows.append(
+                SubscriberImportRow(line=line, email=email, status=status, error=error)
+            )
+
+    async def add(self, line: int, row: Optional[Dict[str, Any]], error: Optional[str]):
+        if error is not None:
+            self._record(line, None, SubscriberImportRowStatus.INVALID, error)
+            return
+        email, name = row.get("email"), row.get("name")
+        # NDJSON values may be any JSON type.
+        for field, value in (("email", email), ("name", name)):
+            if value is not None and not isinstance(value, str):
+                self._record(
+                    line,
+                    None if email is None else str(email),
+                    SubscriberImportRowStatus.INVALID,
+                    f"'{field}' must be a string",
+                )
+                return
+        try:
+            subscriber = SubscriberCreate(
+                email=(email or "").strip(),
+                name=(name or "").strip() or None,
+            )
+        except ValidationError as exc:
+            message = "; ".join(err["msg"] for err in exc.errors())
+            self._record(line, email, SubscriberImportRowStatus.INVALID, message)
+            return
+
+        email = subscriber.email
+        if email in self._batch:
+            self._record(
+                line,
+                email,
+                SubscriberImportRowStatus.DUPLICATE,
+                f"Same email as line {self._batch[email]}",
+            )
+            return
+        self._batch[email] = line
+        self._rows.append({"email": email, "name": subscriber.name})
+        if len(self._rows) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._rows:
+            return
+        written = await crud.subscriber.upsert_many(
+            rows=self._rows,
+            update_existing=self.update_existing,
+            db_session=self.db_session,
+        )
+        for row in self._rows:
+            email = row["email"]
+            status = SubscriberImportRowStatus(
+                written.get(email, SubscriberImportRowStatus.EXISTING.value)
+            )
+            self._record(self._batch[email], email, status)
+        self._batch = {}
+        self._rows = []
+
+    async def run(self, rows: AsyncIterator[ParsedRow]) -> SubscriberImportResult:
+        async for line, row, error in rows:
+            await self.add(line, row, error)
+        await self.flush()
+        self.result.rows.sort(key=lambda r: r.line)
+        return self.result
@@ -0,0 +1,97 @@
+# app/worker.py
+"""
+Standalone delivery worker: `python -m app.worker`.
+
+Runs the scheduler and delivery engine without the HTTP API, using the
+WORKER_DB_* pool settings, so sending can be scaled and tuned separately
+from request handling (start the API with RUN_SCHEDULER=false). With
+leader election on, one worker schedules and the others stand by. Every
+worker resends due retries, and in outbox mode also drains the outbox.
+"""
+from __future__ import annotations
+
+import asyncio
+import signal
+from typing import Optional
+
+from app.core.config import settings
+from app.delivery import flush_all_log_buffers
+from app.email import close_email_transport
+from app.metrics import serve_metrics
+from app.outbox import drain_outbox
+from app.retry import retry_due_deliveries
+from app.scheduler import leader, start_scheduler, stop_scheduler
+
+_retry_poller: Optional[asyncio.Task] = None
+
+
+def start_background_work() -> None:
+    global _retry_poller
+    if settings.SCHEDULER_LEADER_ELECTION:
+        leader.start()
+    else:
+        start_scheduler()
+    # Retries run on every process, leader or not.
+    if _retry_poller is None:
+        _retry_poller = asyncio.get_running_loop().create_task(
+            _retry_due_forever()
+        )
+
+
+async def stop_background_work() -> None:
+    global _retry_poller
+    if _retry_poller is not None:
+        _retry_poller.cancel()
+        _retry_poller = None
+    if settings.SCHEDULER_LEADER_ELECTION:
+        await leader.stop()
+    else:
+        stop_scheduler()
+    await flush_all_log_buffers()
+    await close_email_transport()
+
+
+async def _retry_due_forever() -> None:
+    while True:
+        try:
+            await retry_due_deliveries()
+        except Exception as exc:
+            print(f"[worker] retrying deliveries failed: {exc}")
+        await asyncio.sleep(settings.RETRY_POLL_SECONDS)
+
+
+async def _drain_outbox_forever() -> None:
+    while True:
+        try:
+            await drain_outbox()
+        except Exception as exc:
+            print(f"[worker] outbox drain failed: {exc}")
+        await asyncio.sleep(settings.OUTBOX_POLL_SECONDS)
+
+
+async def run_worker() -> None:
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    start_background_work()
+    metrics_server = None
+    if settings.WORKER_METRICS_PORT:
+        metrics_server = serve_metrics(settings.WORKER_METRICS_PORT)
+    drainer = None
+    if settings.DELIVERY_USE_OUTBOX:
+        drainer = loop.create_task(_drain_outbox_forever())
+    print("[worker] started")
+
+    await stopping.wait()
+    print("[worker] shutting down")
+    if drainer is not None:
+        drainer.cancel()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    await stop_background_work()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -0,0 +1,415 @@
+# benchmarks/delivery.py
+"""
+Delivery throughput benchmark: `python -m benchmarks.delivery`.
+
+Sends one content to topics of increasing size through a FakeTransport
+(configurable latency and failure rate, no network) and records
+emails/sec, DB round trips per email, peak RSS and time-to-first-send as
+JSON under benchmarks/results/ so runs can be compared.
+
+Backends:
+  memory    no database; recipients are generated in process and delivery
+            log writes go to a stand-in session that only counts calls.
+            Measures the fan-out engine, templates and log buffering.
+  postgres  seeds topics into the configured database (alembic upgrade
+            head first) and runs the real send_content_job end to end.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from azure.core.exceptions import ServiceResponseError
+from sqlalchemy import event, text
+
+from app import email as email_module
+from app.core.config import settings
+from app.delivery import ContentDelivery, DeliveryLogBuffer
+from app.email import EmailTransport, RateLimitedTransport
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = "1000,100000,1000000"
+
+
+class FakeTransport(EmailTransport):
+    """
+    Email transport that sleeps `latency` seconds (+/- `jitter`) per request
+    and fails a `failure_rate` fraction of them with a transient error.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.02,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.emails = 0
+        self.failures = 0
+        self.first_send_at: Optional[float] = None
+
+    async def _deliver(self, count: int) -> None:
+        self.requests += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+        if self._random.random() < self.failure_rate:
+            self.failures += count
+            raise ServiceResponseError("fake transport failure")
+        if self.first_send_at is None:
+            self.first_send_at = time.monotonic()
+        self.emails += count
+
+    async def send(self, *, recipient_email: str, **kwargs) -> None:
+        await self._deliver(1)
+
+    async def send_batch(self, *, recipient_emails: List[str], **kwargs) -> None:
+        await self._deliver(len(recipient_emails))
+
+
+class StandInSession:
+    """
+    Just enough of an AsyncSession for DeliveryLogBuffer: every execute and
+    commit counts as one database round trip.
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+
+    async def execute(self, *args, **kwargs) -> None:
+        self.round_trips += 1
+
+    async def commit(self) -> None:
+        self.round_trips += 1
+
+    async def rollback(self) -> None:
+        self.round_trips += 1
+
+
+class RssSampler:
+    """
+    Tracks the peak resident set size while a run is in progress.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def current_bytes() -> int:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            # No procfs: fall back to the lifetime peak (KiB on Linux).
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    async def _sample(self) -> None:
+        while True:
+            self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self.peak_bytes = self.current_bytes()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    def stop(self) -> None:
+        self.peak_bytes = max(self.peak_bytes, self.current_bytes())
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+async def _generated_recipients(count: int):
+    for i in range(count):
+        yield SimpleNamespace(
+            id=uuid4(), email=f"bench-{i}@example.invalid", name=f"Reader {i}"
+        )
+        if i % 1000 == 0:
+            # Stand-in for the page fetch, so the producer yields to workers.
+            await asyncio.sleep(0)
+
+
+async def _run_memory(size: int, transport: FakeTransport) -> Dict[str, Any]:
+    content = SimpleNamespace(
+        id=uuid4(),
+        subject="Benchmark issue",
+        body="Hello from the delivery benchmark.",
+        updated_at=datetime.utcnow(),
+    )
+    session = StandInSession()
+    async with DeliveryLogBuffer(session) as log_buffer:
+        await ContentDelivery(content, log_buffer).run(_generated_recipients(size))
+    return {"db_round_trips": session.round_trips}
+
+
+async def _seed_topic(engine, size: int) -> Any:
+    """
+    Create (or reuse) topic "bench-<size>" with `size` subscribers, inserted
+    set-wise with generate_series in slices of 100k rows.
+    """
+    name = f"bench-{size}"
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                """
+                INSERT INTO "Topic" (id, name, description, created_at, updated_at)
+                VALUES (gen_random_uuid(), :name, 'delivery benchmark',
+                        now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc')
+                ON CONFLICT (name) DO NOTHING
+                """
+            ),
+            {"name": name},
+        )
+        topic_id = (
+            await conn.execute(
+                text('SELECT id FROM "Topic" WHERE name = :name'), {"name": name}
+            )
+        ).scalar_one()
+        existing = (
+            await conn.execute(
+                text('SELECT count(*) FROM "Subscription" WHERE topic_id = :topic_id'),
+                {"topic_id": topic_id},
+            )
+        ).scalar_one()
+    if existing >= size:
+        return topic_id
+
+    print(f"[benchmark] seeding {size} subscribers for topic {name}")
+    for low in range(1, size + 1, 100_000):
+        high = min(low + 99_999, size)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO "Subscriber" (id, name, email, created_at, updated_at)
+                    SELECT gen_random_uuid(), 'Reader ' || i,
+                           :prefix || i || '@example.invalid',
+                           now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+                    FROM generate_series(CAST(:low AS int), CAST(:high AS int)) AS i
+                    ON CONFLICT (email) DO NOTHING
+                    """
+                ),
+                {"prefix": f"{name}-", "low": low, "high": high},
+            )
+            await conn.execute(
+                text(
+                    """
+                    INSERT INTO "Subscription" (id, subscriber_id, topic_id, created_at, updated_at)
+                    SELECT gen_random_uuid(), s.id, :topic_id,
+                           now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+                    FROM generate_series(CAST(:low AS int), CAST(:high AS int)) AS i
+                    JOIN "Subscriber" s ON s.email = :prefix || i || '@example.invalid'
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM "Subscription" x
+                        WHERE x.subscriber_id = s.id AND x.topic_id = :topic_id
+                    )
+                    """
+                ),
+                {"prefix": f"{name}-", "low": low, "high": high, "topic_id": topic_id},
+            )
+    return topic_id
+
+
+async def _prepare_postgres(size: int) -> Any:
+    """
+    Seed the topic and insert the content to send; runs before the clock
+    and RSS sampler start so seeding is not measured.
+    """
+    from app.db.session import engine
+
+    topic_id = await _seed_topic(engine, size)
+    content_id = uuid4()
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                """
+                INSERT INTO "Content" (id, subject, body, scheduled_time, topic_id,
+                                       status, created_at, updated_at)
+                VALUES (:id, 'Benchmark issue', 'Hello from the delivery benchmark.',
+                        now(), :topic_id, 'scheduled',
+                        now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc')
+                """
+            ),
+            {"id": content_id, "topic_id": topic_id},
+        )
+    return content_id
+
+
+async def _run_postgres(content_id: Any) -> Dict[str, Any]:
+    from app.db.session import engine
+    from app.scheduler import send_content_job
+
+    round_trips = 0
+
+    def count_round_trip(*args) -> None:
+        nonlocal round_trips
+        round_trips += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_round_trip)
+    event.listen(engine.sync_engine, "commit", count_round_trip)
+    try:
+        await send_content_job(str(content_id))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_round_trip)
+        event.remove(engine.sync_engine, "commit", count_round_trip)
+    return {"db_round_trips": round_trips, "content_id": str(content_id)}
+
+
+async def _cleanup_postgres(content_id: Any) -> None:
+    from app.db.session import engine
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text('DELETE FROM "DeliveryLog" WHERE content_id = :id'),
+            {"id": content_id},
+        )
+        await conn.execute(
+            text('DELETE FROM "Content" WHERE id = :id'), {"id": content_id}
+        )
+
+
+async def run_size(args: argparse.Namespace, size: int) -> Dict[str, Any]:
+    transport = FakeTransport(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    # Installed as the process-wide transport, so send_content_job uses it too.
+    email_module._transport = (
+        RateLimitedTransport(transport) if args.rate_limit else transport
+    )
+
+    content_id = None
+    if args.backend == "postgres":
+        content_id = await _prepare_postgres(size)
+
+    sampler = RssSampler()
+    sampler.start()
+    started = time.monotonic()
+    try:
+        with contextlib.ExitStack() as output:
+            if not args.verbose:
+                # Discard per-recipient log lines instead of buffering them,
+                # which would inflate peak RSS and the measured send time.
+                devnull = output.enter_context(open(os.devnull, "w"))
+                output.enter_context(contextlib.redirect_stdout(devnull))
+            if args.backend == "postgres":
+                extra = await _run_postgres(content_id)
+            else:
+                extra = await _run_memory(size, transport)
+    finally:
+        elapsed = time.monotonic() - started
+        sampler.stop()
+        if content_id is not None and not args.keep:
+            await _cleanup_postgres(content_id)
+
+    return {
+        "subscribers": size,
+        "emails_sent": transport.emails,
+        "emails_failed": transport.failures,
+        "provider_requests": transport.requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "emails_per_second": round(transport.emails / elapsed, 1) if elapsed else 0.0,
+        "db_round_trips_per_email": round(
+            extra["db_round_trips"] / max(transport.emails + transport.failures, 1), 4
+        ),
+        "peak_rss_mb": round(sampler.peak_bytes / (1024 * 1024), 1),
+        "time_to_first_send_seconds": (
+            round(transport.first_send_at - started, 4)
+            if transport.first_send_at
+            else None
+        ),
+        **extra,
+    }
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    settings.DELIVERY_CONCURRENCY = args.concurrency or settings.DELIVERY_CONCURRENCY
+    settings.EMAIL_BATCH_MODE = args.batch
+    if args.rate is not None:
+        settings.EMAIL_RATE_LIMIT_PER_SECOND = args.rate
+    report: Dict[str, Any] = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "backend": args.backend,
+        "config": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "failure_rate": args.failure_rate,
+            "rate_limit": args.rate_limit,
+            "rate_per_second": settings.EMAIL_RATE_LIMIT_PER_SECOND,
+            "seed": args.seed,
+            "delivery_concurrency": settings.DELIVERY_CONCURRENCY,
+            "email_batch_mode": settings.EMAIL_BATCH_MODE,
+            "email_batch_size": settings.EMAIL_BATCH_SIZE,
+            "recipient_chunk_size": settings.DELIVERY_RECIPIENT_CHUNK_SIZE,
+            "log_buffer_size": settings.DELIVERY_LOG_BUFFER_SIZE,
+            "use_outbox": settings.DELIVERY_USE_OUTBOX,
+        },
+        "results": [],
+    }
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        result = await run_size(args, size)
+        print(f"[benchmark] {json.dumps(result)}")
+        report["results"].append(result)
+    return report
+
+
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backend", choices=["memory", "postgres"], default="memory")
+    parser.add_argument(
+        "--sizes", default=DEFAULT_SIZES, help="comma separated subscriber counts"
+    )
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--batch", action="store_true", help="send BCC batches")
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="wrap the fake transport in RateLimitedTransport",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="provider quota in sends/sec for --rate-limit "
+        "(default EMAIL_RATE_LIMIT_PER_SECOND; 0 passes sends straight through)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--keep", action="store_true", help="keep benchmark contents and delivery logs"
+    )
+    parser.add_argument("--verbose", action="store_true", help="show delivery logging")
+    parser.add_argument("--output", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(main(args))
+    output = args.output or RESULTS_DIR / (
+        f"delivery-{args.backend}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"[benchmark] results written to {output}")